@@ -0,0 +1,142 @@
+import asyncio
+import time
+import weakref
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+from openai import AsyncOpenAI
+
+from connect4_main import Connect4Game
+from rock_paper_scissor_main import RockPaperScissorsGame
+
+
+class ProviderPool:
+    """Shares HTTP connections and caps in-flight requests per model provider.
+
+    Every OpenAI model run through the pool gets an AsyncOpenAI client built
+    from its own settings over a single pooled httpx.AsyncClient, instead of
+    opening a new connection pool for each call. Clients are made on a model's
+    first call, so games whose colours are all played locally need no API key.
+    Calls through `run` wait on a semaphore for their provider, so one process
+    can drive many games without exceeding rate limits. Semaphores and
+    connections belong to one event loop; when the pool is used from a new
+    loop, e.g. a later asyncio.run, they are replaced.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default_limit: int = 16, max_connections: int = 100):
+        self.limits = limits or {}
+        self.default_limit = default_limit
+        self.max_connections = max_connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        # Clients made for earlier loops; models still holding one get a new client
+        self._clients: "weakref.WeakSet[AsyncOpenAI]" = weakref.WeakSet()
+        self._stale_clients: "weakref.WeakSet[AsyncOpenAI]" = weakref.WeakSet()
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphores = {}
+            self._http_client = None
+            self._stale_clients.update(self._clients)
+            self._clients = weakref.WeakSet()
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.limits.get(provider, self.default_limit))
+        return self._semaphores[provider]
+
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            )
+        return self._http_client
+
+    def attach(self, agent: Agent) -> None:
+        """Point the agent's model at a pooled client if it talks to OpenAI and has no usable async client yet"""
+        model = agent.model
+        if isinstance(model, OpenAIChat) and (model.async_client is None or model.async_client in self._stale_clients):
+            model.async_client = AsyncOpenAI(**model._get_client_params(), http_client=self.http_client())
+            self._clients.add(model.async_client)
+
+    async def run(self, agent: Agent, message: str):
+        self._bind_loop()
+        self.attach(agent)
+        provider = agent.model.provider if agent.model is not None else "local"
+        async with self.semaphore(provider):
+            return await agent.arun(message)
+
+    async def aclose(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+
+@lru_cache(maxsize=None)
+def shared_pool() -> ProviderPool:
+    """The pool games use when none is passed, so limits and connections are shared across the process"""
+    return ProviderPool()
+
+
+class AsyncConnect4Game(Connect4Game):
+    """Connect Four with an asyncio game loop.
+
+    Moves are driven from Python as in `Connect4Game.play`; LLM players are
+    awaited through the provider pool and local players run in a worker thread
+    so the event loop keeps serving other games.
+    """
+
+    def __init__(self, *args, pool: Optional[ProviderPool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool if pool is not None else shared_pool()
+
+    async def play_async(self, on_move: Optional[Callable[[str, int], None]] = None) -> str:
+        self._last_move_at = time.perf_counter()
+        result = ""
+        while not result:
+            piece = self.board.current_piece
+            player = self.players[piece]
+            if player is not None:
+                col = await asyncio.to_thread(player.choose_move, self.board)
+            else:
+                col = (await self._ask_agent(piece, run=self.pool.run)).column
+            result = self._apply_move(piece, col, on_move)
+        return result
+
+
+class AsyncRockPaperScissorsGame(RockPaperScissorsGame):
+    """Rock-Paper-Scissors with an asyncio loop; RED and YELLOW choose concurrently each round"""
+
+    def __init__(self, *args, pool: Optional[ProviderPool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool if pool is not None else shared_pool()
+
+    async def _choose(self, color: str) -> str:
+        player = self.players[color]
+        if player is not None:
+            return player.choose()
+        return (await self._ask_agent(color, run=self.pool.run)).choice
+
+    async def play_async(
+        self, rounds: int = 5, on_round: Optional[Callable[[int, str, str, str], None]] = None
+    ) -> str:
+        self._new_match(rounds)
+        for round_number in range(1, rounds + 1):
+            self.round_number = round_number
+            red, yellow = await asyncio.gather(self._choose("RED"), self._choose("YELLOW"))
+            result = self._finish_round(red, yellow)
+            if on_round is not None:
+                on_round(round_number, red, yellow, result)
+        return self.score.result()
+
+
+async def play_many(games: List[Awaitable[str]]) -> List[str]:
+    """Run many game coroutines at once; exceptions are returned in place of a result"""
+    results = await asyncio.gather(*games, return_exceptions=True)
+    return [r if isinstance(r, str) else f"ERROR: {r}" for r in results]
@@ -0,0 +1,68 @@
+"""Measure what the Streamlit apps pay at startup and on every click.
+
+Import times are taken in fresh interpreters; the provider SDK line is the
+cost now deferred until the first real model is built. Each app is run once
+cold and then rerun, as Streamlit does on every interaction, and building a
+game is compared with the reset() the apps now do per click.
+
+    python benchmarks/app_startup.py
+"""
+import os
+import subprocess
+import sys
+import time
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Agents are only built here, nothing is sent, so no real key is needed
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("AGNO_TELEMETRY", "false")
+
+
+def import_time(module: str, repeat: int = 3) -> float:
+    """Best wall time of `import module` in a fresh interpreter, minus the bare interpreter start"""
+
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        return time.perf_counter() - start
+
+    baseline = min(run("pass") for _ in range(repeat))
+    return min(run(f"import {module}") for _ in range(repeat)) - baseline
+
+
+def per_call(fn: Callable[[], object], repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    for module in ("connect4_main", "rock_paper_scissor_main", "agno.models.openai"):
+        print(f"import {module:<26}{import_time(module) * 1000:>9.0f} ms")
+
+    from streamlit.testing.v1 import AppTest
+
+    for app in ("connect4_app.py", "rock_paper_scissor_app.py"):
+        test = AppTest.from_file(os.path.join(ROOT, app))
+        start = time.perf_counter()
+        test.run(timeout=60)
+        cold = time.perf_counter() - start
+        rerun = per_call(lambda: test.run(timeout=60), repeat=5)
+        print(f"{app + ' first run':<33}{cold * 1000:>9.0f} ms")
+        print(f"{app + ' rerun':<33}{rerun * 1000:>9.0f} ms")
+
+    from connect4_main import Connect4Game
+    from rock_paper_scissor_main import RockPaperScissorsGame
+
+    for name, cls in (("Connect4Game", Connect4Game), ("RockPaperScissorsGame", RockPaperScissorsGame)):
+        game = cls()
+        print(f"{name + '()':<33}{per_call(cls) * 1000:>9.2f} ms per click before")
+        print(f"{name + '.reset()':<33}{per_call(game.reset) * 1000:>9.3f} ms per click now")
+
+
+if __name__ == "__main__":
+    main()
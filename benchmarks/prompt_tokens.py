@@ -0,0 +1,51 @@
+"""Compare prompt tokens for the old board repr against ConnectFourBoard.encode().
+
+Uses tiktoken's gpt-4o encoding when it is available and a rough
+word/punctuation split otherwise (e.g. offline, when tiktoken cannot fetch
+its encoding files).
+
+    python benchmarks/prompt_tokens.py
+"""
+import os
+import random
+import re
+import sys
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connect4_board import ConnectFourBoard  # noqa: E402
+
+
+def token_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.encoding_for_model("gpt-4o")
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        return lambda text: len(re.findall(r"\w+|[^\w\s]", text))
+
+
+def random_position(rows: int, cols: int, rng: random.Random) -> ConnectFourBoard:
+    board = ConnectFourBoard(rows, cols)
+    for _ in range(rng.randint(0, rows * cols)):
+        if board.check_winner() or board.is_full():
+            break
+        board.drop_piece(rng.choice(board.legal_moves()))
+    return board
+
+
+def main(samples: int = 200, seed: int = 0) -> None:
+    count = token_counter()
+    rng = random.Random(seed)
+    print(f"{'board':<8}{'repr tokens':>14}{'encode tokens':>16}{'saving':>10}")
+    for rows, cols in ((4, 4), (6, 7), (8, 8)):
+        boards = [random_position(rows, cols, rng) for _ in range(samples)]
+        old = sum(count(str(b.get_board_state())) for b in boards) / samples
+        new = sum(count(b.encode()) for b in boards) / samples
+        print(f"{f'{rows}x{cols}':<8}{old:>14.1f}{new:>16.1f}{1 - new / old:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
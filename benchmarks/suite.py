@@ -0,0 +1,245 @@
+"""Benchmark suite for board operations, local players and full games.
+
+Everything runs offline: LLM players are played by FakeModel, which replays
+canned replies with a fixed simulated latency, so results only move when the
+code does. The Connect Four game benchmarks run Connect4Game.play(), the
+player-only loop, so the master agent and its tools (start_game) are not
+measured. Results are written as JSON together with the commit they were
+measured on; pass --compare with an earlier file to see the change per
+benchmark.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --quick --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Offline runs should not report agent telemetry over the network
+os.environ.setdefault("AGNO_TELEMETRY", "false")
+
+import numpy as np  # noqa: E402
+
+from async_games import AsyncConnect4Game, AsyncRockPaperScissorsGame, play_many  # noqa: E402
+from connect4_batch import BatchConnectFourBoard  # noqa: E402
+from connect4_board import ConnectFourBoard  # noqa: E402
+from connect4_main import Connect4Game  # noqa: E402
+from connect4_mcts import MCTSPlayer  # noqa: E402
+from connect4_solver import NegamaxPlayer  # noqa: E402
+from fake_model import FakeModel  # noqa: E402
+from rock_paper_scissor_main import RockPaperScissorsGame  # noqa: E402
+from rock_paper_scissor_players import EnsemblePlayer, MarkovPlayer  # noqa: E402
+
+# Simulated round trip of the stand-in model, in seconds
+MODEL_LATENCY = 0.005
+RPS_REPLIES = ['{"choice": "Rock"}', '{"choice": "Paper"}', '{"choice": "Scissors"}', '{"choice": "Paper"}']
+
+
+def best_of(fn: Callable[[], int], repeat: int) -> Dict[str, float]:
+    """Run fn `repeat` times; fn returns how many operations it did. Reports the best run."""
+    best_time, ops = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = fn()
+        best_time = min(best_time, time.perf_counter() - start)
+    return {"seconds": best_time, "ops": ops, "ops_per_sec": ops / best_time}
+
+
+def random_position(rng: random.Random, plies: int) -> ConnectFourBoard:
+    board = ConnectFourBoard(6, 7)
+    while board.move_count < plies and not board.check_winner() and not board.is_full():
+        board.drop_piece(rng.choice(board.legal_moves()))
+    return board
+
+
+def board_benchmarks(scale: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    board = ConnectFourBoard(6, 7)
+    position = random_position(random.Random(0), 10)
+    # Red to move, and dropping into column 3 completes the bottom row
+    near_win = ConnectFourBoard(6, 7)
+    for col in (0, 0, 1, 1, 2, 2):
+        near_win.drop_piece(col)
+
+    def drop_and_undo() -> int:
+        for _ in range(scale * 20_000):
+            board.drop_piece(3)
+            board.undo_move()
+        return scale * 20_000
+
+    def winning_drop_and_undo() -> int:
+        # check_winner only reads the result drop_piece cached, so time the win test itself
+        for _ in range(scale * 20_000):
+            near_win.drop_piece(3)
+            near_win.undo_move()
+        return scale * 20_000
+
+    def is_full() -> int:
+        for _ in range(scale * 20_000):
+            position.is_full()
+        return scale * 20_000
+
+    def random_games() -> int:
+        rng = random.Random(1)
+        for _ in range(scale * 20):
+            game = ConnectFourBoard(6, 7)
+            while not game.check_winner() and not game.is_full():
+                game.drop_piece(rng.choice(game.legal_moves()))
+        return scale * 20
+
+    def batch_random_games() -> int:
+        batch = BatchConnectFourBoard(scale * 1000, 6, 7)
+        batch.playout(np.random.default_rng(1))
+        return batch.n
+
+    return {
+        "board.drop_piece+undo_move": best_of(drop_and_undo, repeat),
+        "board.winning_drop+undo_move": best_of(winning_drop_and_undo, repeat),
+        "board.is_full": best_of(is_full, repeat),
+        "board.random_games_6x7": best_of(random_games, repeat),
+        "batch.random_games_6x7": best_of(batch_random_games, repeat),
+    }
+
+
+def player_benchmarks(scale: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    positions = [random_position(random.Random(seed), 8) for seed in range(scale * 2)]
+
+    def solver(depth: int) -> Callable[[], int]:
+        def run() -> int:
+            player = NegamaxPlayer(max_depth=depth, time_limit=60, seed=0)
+            for board in positions:
+                player.choose_move(board)
+            return len(positions)
+
+        return run
+
+    def mcts(playouts: int) -> Callable[[], int]:
+        def run() -> int:
+            player = MCTSPlayer(playouts=playouts, time_limit=None, reuse_tree=False, seed=0)
+            for board in positions:
+                player.choose_move(board)
+            return len(positions)
+
+        return run
+
+    return {
+        "solver.move_depth_6": best_of(solver(6), repeat),
+        "mcts.move_1000_playouts": best_of(mcts(1000), repeat),
+    }
+
+
+def first_legal(prompt: str) -> str:
+    """Canned Connect Four reply: the first legal column listed in the prompt"""
+    legal = json.loads(prompt.split("Legal moves: ")[1].split("\n")[0])
+    return json.dumps({"column": legal[0], "reason": "First legal column"})
+
+
+def game_benchmarks(scale: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    def connect4_model() -> FakeModel:
+        return FakeModel(responder=first_legal, latency=MODEL_LATENCY)
+
+    def rps_model() -> FakeModel:
+        return FakeModel(responses=RPS_REPLIES, latency=MODEL_LATENCY)
+
+    def connect4_games() -> int:
+        for _ in range(scale):
+            Connect4Game(model_factory=connect4_model).play()
+        return scale
+
+    def rps_matches() -> int:
+        for _ in range(scale):
+            RockPaperScissorsGame(model_factory=rps_model).play(rounds=5)
+        return scale
+
+    def async_connect4_games() -> int:
+        games = [AsyncConnect4Game(model_factory=connect4_model).play_async() for _ in range(scale * 10)]
+        asyncio.run(play_many(games))
+        return len(games)
+
+    def async_rps_matches() -> int:
+        games = [AsyncRockPaperScissorsGame(model_factory=rps_model).play_async(5) for _ in range(scale * 10)]
+        asyncio.run(play_many(games))
+        return len(games)
+
+    def rps_local_rounds() -> int:
+        rounds = scale * 20_000
+        RockPaperScissorsGame(
+            red_player=EnsemblePlayer(seed=0), yellow_player=MarkovPlayer(2, seed=1), model_factory=rps_model
+        ).play(rounds=rounds)
+        return rounds
+
+    return {
+        "game.connect4_fake_model": best_of(connect4_games, repeat),
+        "game.rps_fake_model": best_of(rps_matches, repeat),
+        "game.connect4_fake_model_async": best_of(async_connect4_games, repeat),
+        "game.rps_fake_model_async": best_of(async_rps_matches, repeat),
+        "game.rps_local_rounds": best_of(rps_local_rounds, repeat),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit') or 'unknown commit'})")
+    for name, row in results.items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<34}{'new':>12}")
+            continue
+        change = row["ops_per_sec"] / old["ops_per_sec"] - 1
+        print(f"{name:<34}{change:>+11.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and store the results as JSON")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads and one repeat, for a fast check")
+    parser.add_argument("--only", nargs="+", choices=("board", "players", "games"), help="Run only these groups")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    scale, repeat = (1, 1) if args.quick else (5, 3)
+    groups = {"board": board_benchmarks, "players": player_benchmarks, "games": game_benchmarks}
+    results: Dict[str, Dict[str, float]] = {}
+    for name in args.only or groups:
+        results.update(groups[name](scale, repeat))
+
+    print(f"{'benchmark':<34}{'ops/sec':>12}{'seconds':>10}")
+    for name, row in results.items():
+        print(f"{name:<34}{row['ops_per_sec']:>12.1f}{row['seconds']:>10.3f}")
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
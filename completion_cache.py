@@ -0,0 +1,145 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+
+class CompletionCache:
+    """Two-tier cache of model completions: an in-memory LRU in front of SQLite.
+
+    Keys are built from the model id and the normalized text of every message
+    sent to the model, i.e. the agent's role/instructions and the prompt that
+    carries the board. Calls that involve tools are never cached. A cached
+    reply always returns the same text for the same prompt, so only wrap
+    models whose players are meant to be deterministic.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_size: int = 4096):
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Tuple[str, int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS completions "
+                "(key TEXT PRIMARY KEY, content TEXT, input_tokens INTEGER, output_tokens INTEGER)"
+            )
+            self._db.commit()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def key_for(model: Model, messages: List[Message]) -> Optional[str]:
+        """Normalized key for a request, or None if the request must not be cached"""
+        if model.tools or any(m.role == "tool" or m.tool_calls for m in messages):
+            return None
+        parts = [model.id]
+        for m in messages:
+            text = re.sub(r"\s+", " ", m.get_content_string()).strip()
+            parts.append(f"{m.role}:{text}")
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, int, int]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT content, input_tokens, output_tokens FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._remember(key, tuple(row))
+                    return tuple(row)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, content: str, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        with self._lock:
+            self._remember(key, (content, input_tokens, output_tokens))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)",
+                    (key, content, input_tokens, output_tokens),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, entry: Tuple[str, int, int]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _replay(self, messages: List[Message], entry: Tuple[str, int, int]) -> ModelResponse:
+        content, input_tokens, output_tokens = entry
+        self.bytes_saved += sum(len(m.get_content_string().encode()) for m in messages) + len(content.encode())
+        self.tokens_saved += input_tokens + output_tokens
+        messages.append(Message(role="assistant", content=content))
+        return ModelResponse(content=content)
+
+    def _store(self, key: str, messages: List[Message], model_response: ModelResponse) -> None:
+        if model_response.tool_calls or not isinstance(model_response.content, str):
+            return
+        metrics = messages[-1].metrics if messages and messages[-1].role == "assistant" else {}
+        self.put(key, model_response.content, metrics.get("input_tokens", 0), metrics.get("output_tokens", 0))
+
+    def wrap(self, model: Model) -> Model:
+        """Route the model's non-streaming responses through this cache"""
+        response, aresponse = model.response, model.aresponse
+
+        def cached_response(messages: List[Message]) -> ModelResponse:
+            key = self.key_for(model, messages)
+            entry = self.get(key) if key is not None else None
+            if entry is not None:
+                return self._replay(messages, entry)
+            model_response = response(messages)
+            if key is not None:
+                self._store(key, messages, model_response)
+            return model_response
+
+        async def cached_aresponse(messages: List[Message]) -> ModelResponse:
+            key = self.key_for(model, messages)
+            entry = self.get(key) if key is not None else None
+            if entry is not None:
+                return self._replay(messages, entry)
+            model_response = await aresponse(messages)
+            if key is not None:
+                self._store(key, messages, model_response)
+            return model_response
+
+        model.response = cached_response
+        model.aresponse = cached_aresponse
+        return model
+
+    def stats(self) -> Dict[str, float]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "tokens_saved": self.tokens_saved,
+            "memory_entries": len(self._memory),
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
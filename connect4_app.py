@@ -1,36 +1,60 @@
+import os
+
 import streamlit as st
 from connect4_main import Connect4Game
+from game_records import GameRecordWriter
+from streamlit_render import ThrottledRenderer, show_board
+
+# Every game played in the app is appended here (set CONNECT4_RECORDS to move it, or to "" to turn
+# recording off); analyse with `python game_records.py stats`
+RECORDS_PATH = os.getenv("CONNECT4_RECORDS", "connect4_games.jsonl")
 
 # Streamlit UI
 st.title("🤖 Connect Four AI Battle")
 
+# Agents are built once per session and reused for every game
+if "game" not in st.session_state:
+    st.session_state.game = Connect4Game()
+game = st.session_state.game
+
 # Button to start the game
 if st.button("Start Game"):
     st.write("### 🕹️ Game in Progress...")
 
-    game = Connect4Game()
-    
-    # Placeholder to stream output
-    output_placeholder = st.empty()
+    game.reset()
+
+    # The board grid is redrawn when a move lands; commentary is streamed below it
+    board_placeholder = st.empty()
+    show_board(board_placeholder, game.board)
+    renderer = ThrottledRenderer()
 
     try:
         # Start the game and stream the response
         response = game.agents["master"].run(
-            f"Current board state:\n{game.board.get_board_state()}\n"
-            "Keep managing and outpting board until there is a winner. Red plays first, then yellow and they keep switching.",
+            f"Current board state: {game.board.encode()}\n"
+            "Keep managing the game until there is a winner. Red plays first, then yellow and they keep switching. "
+            "The board is displayed to the user separately, so do not print it.",
             stream=True,
         )
 
-        full_output = ""  # To accumulate the streamed response
-
         # Stream the output to the UI
+        shown_moves = 0
         for chunk in response:
-            full_output += chunk.content
-            output_placeholder.markdown(full_output)  # Dynamically update the UI
+            renderer.write(chunk.content)
+            if game.board.move_count != shown_moves:
+                shown_moves = game.board.move_count
+                show_board(board_placeholder, game.board)
+        renderer.flush()
+        show_board(board_placeholder, game.board)
 
         # Final output
         st.success("🎯 Game Over!")
-        st.text_area("📜 Full Game Log", full_output, height=400)
+        st.text_area("📜 Full Game Log", renderer.text, height=400)
+
+        # Games the master abandons are kept too, with an empty result
+        if RECORDS_PATH:
+            with GameRecordWriter(RECORDS_PATH) as writer:
+                writer.write(game.record)
 
     except Exception as e:
         st.error(f"Error starting game: {str(e)}")
@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from connect4_board import CONNECT, EMPTY, PIECES, ConnectFourBoard
+
+
+# Cell values; RED is 1 and YELLOW is 2 so that `turn` doubles as the piece to place
+RED, YELLOW = 1, 2
+# (row step, column step) for horizontal, vertical and both diagonal lines
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def _has_line(mask: np.ndarray) -> np.ndarray:
+    """Sliding-window sums over every direction of a (N, rows, cols) 0/1 array; True where a board has CONNECT in a row"""
+    n, rows, cols = mask.shape
+    found = np.zeros(n, dtype=bool)
+    for dr, dc in DIRECTIONS:
+        row_span, col_span = (CONNECT - 1) * dr, (CONNECT - 1) * abs(dc)
+        if row_span >= rows or col_span >= cols:
+            continue
+        total = np.zeros((n, rows - row_span, cols - col_span), dtype=np.int8)
+        for k in range(CONNECT):
+            r = k * dr
+            c = k if dc == 1 else col_span - k if dc == -1 else 0
+            total += mask[:, r:r + rows - row_span, c:c + cols - col_span]
+        found |= (total == CONNECT).any(axis=(1, 2))
+    return found
+
+
+class BatchConnectFourBoard:
+    """Many Connect Four boards stepped in lockstep with NumPy.
+
+    `cells` is an (N, rows, cols) int8 array with the top row first, as in
+    ConnectFourBoard.get_board_state(), holding 0 for empty, 1 for RED and 2
+    for YELLOW. Every operation works on all boards at once, so a playout of
+    N games costs at most rows * cols vectorized steps rather than a Python
+    loop per board.
+    """
+
+    def __init__(self, n: int, rows: int = 4, cols: int = 4):
+        if n < 1 or rows < 1 or cols < 1:
+            raise ValueError(f"Batch size and board dimensions must be positive, got {n} of {rows}x{cols}")
+        self.n = n
+        self.rows = rows
+        self.cols = cols
+        self.reset_board()
+
+    def reset_board(self) -> None:
+        self.cells = np.zeros((self.n, self.rows, self.cols), dtype=np.int8)
+        self.heights = np.zeros((self.n, self.cols), dtype=np.int16)
+        self.turn = np.full(self.n, RED, dtype=np.int8)
+        self.winner = np.zeros(self.n, dtype=np.int8)
+        self.move_count = np.zeros(self.n, dtype=np.int16)
+
+    @classmethod
+    def from_boards(cls, boards: List[ConnectFourBoard]) -> "BatchConnectFourBoard":
+        """Batch of copies of existing boards, which must all have the same size"""
+        batch = cls(len(boards), boards[0].rows, boards[0].cols)
+        for i, board in enumerate(boards):
+            if (board.rows, board.cols) != (batch.rows, batch.cols):
+                raise ValueError("All boards in a batch must have the same dimensions")
+            batch.load(i, board)
+        return batch
+
+    @classmethod
+    def repeat(cls, board: ConnectFourBoard, n: int) -> "BatchConnectFourBoard":
+        """N copies of one position, e.g. for Monte Carlo evaluation of that position"""
+        batch = cls(1, board.rows, board.cols)
+        batch.load(0, board)
+        for name in ("cells", "heights", "turn", "winner", "move_count"):
+            setattr(batch, name, np.repeat(getattr(batch, name), n, axis=0))
+        batch.n = n
+        return batch
+
+    def load(self, i: int, board: ConnectFourBoard) -> None:
+        state = board.get_board_state()
+        self.cells[i] = [[0 if cell == EMPTY else RED if cell == PIECES[0] else YELLOW for cell in row] for row in state]
+        self.heights[i] = (self.cells[i] != 0).sum(axis=0)
+        self.turn[i] = RED if board.current_piece == PIECES[0] else YELLOW
+        winner = board.check_winner()
+        self.winner[i] = 0 if not winner else RED if winner == PIECES[0] else YELLOW
+        self.move_count[i] = board.move_count
+
+    def board(self, i: int) -> ConnectFourBoard:
+        """Board i as a ConnectFourBoard; move order is not recoverable, as with decode()"""
+        return ConnectFourBoard.decode("/".join("".join((EMPTY, *PIECES)[v] for v in row) for row in self.cells[i]))
+
+    @property
+    def done(self) -> np.ndarray:
+        """True for boards that have a winner or no empty cells"""
+        return (self.winner != 0) | (self.move_count == self.rows * self.cols)
+
+    def legal_mask(self) -> np.ndarray:
+        """(N, cols) True where a piece can be dropped; all False on finished boards"""
+        return (self.heights < self.rows) & ~self.done[:, None]
+
+    def drop_piece(self, cols: np.ndarray) -> np.ndarray:
+        """Drop the side to move's piece into cols[i] on every board i.
+
+        Boards that are finished, or whose column is full or out of range,
+        are left unchanged. Returns a boolean mask of the boards that moved.
+        """
+        cols = np.asarray(cols)
+        in_range = (cols >= 0) & (cols < self.cols)
+        safe_cols = np.where(in_range, cols, 0)
+        idx = np.arange(self.n)
+        moved = in_range & self.legal_mask()[idx, safe_cols]
+
+        idx, col = idx[moved], safe_cols[moved]
+        self.cells[idx, self.rows - 1 - self.heights[idx, col], col] = self.turn[idx]
+        self.heights[idx, col] += 1
+        self.move_count[idx] += 1
+
+        won = _has_line(self.cells[idx] == self.turn[idx, None, None])
+        self.winner[idx[won]] = self.turn[idx[won]]
+        self.turn[idx] = 3 - self.turn[idx]
+        return moved
+
+    def winning_moves(self) -> np.ndarray:
+        """(N, cols) True where the side to move would win immediately"""
+        wins = np.zeros((self.n, self.cols), dtype=bool)
+        legal = self.legal_mask()
+        for col in range(self.cols):
+            idx = np.flatnonzero(legal[:, col])
+            row = self.rows - 1 - self.heights[idx, col]
+            self.cells[idx, row, col] = self.turn[idx]
+            wins[idx, col] = _has_line(self.cells[idx] == self.turn[idx, None, None])
+            self.cells[idx, row, col] = 0
+        return wins
+
+    def random_moves(self, rng: np.random.Generator, greedy: bool = False) -> np.ndarray:
+        """A uniformly random legal column per board (-1 on finished boards).
+
+        With greedy=True an immediately winning column is taken when there is one.
+        """
+        legal = self.legal_mask()
+        scores = rng.random((self.n, self.cols)) + legal
+        if greedy:
+            scores += 2 * self.winning_moves()
+        return np.where(legal.any(axis=1), scores.argmax(axis=1), -1)
+
+    def playout(self, rng: Optional[np.random.Generator] = None, greedy: bool = False) -> np.ndarray:
+        """Play every board to the end with random (or greedy) moves and return the winner array"""
+        rng = rng if rng is not None else np.random.default_rng()
+        while not self.done.all():
+            self.drop_piece(self.random_moves(rng, greedy))
+        return self.winner
+
+    def results(self) -> Dict[str, int]:
+        """Result counts over the batch, using the game's result strings"""
+        done = self.done
+        return {
+            "WINNER - RED": int((self.winner == RED).sum()),
+            "WINNER - YELLOW": int((self.winner == YELLOW).sum()),
+            "TIE": int((done & (self.winner == 0)).sum()),
+            "UNFINISHED": int((~done).sum()),
+        }
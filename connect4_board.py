@@ -1,71 +1,191 @@
-from dataclasses import dataclass
-from typing import List, Tuple
+import random
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 
+PIECES = ("R", "Y")
+EMPTY = "."
+CONNECT = 4
 
-@dataclass
-class ConnectFourBoard:
-    """Represents the Connect Four board state and provides utility methods"""
 
-    def __init__(self):
-        # Simple representation: "R" for Red, "Y" for Yellow, "." for Empty
-        self.rows = 4
-        self.cols = 4
-        self.board = [["." for _ in range(self.cols)] for _ in range(self.rows)]
+@lru_cache(maxsize=None)
+def zobrist_keys(rows: int, cols: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Random 64-bit keys per player and bit position, fixed for a given board size."""
+    rng = random.Random(f"zobrist-{rows}x{cols}")
+    size = cols * (rows + 1)
+    return tuple(
+        tuple(rng.getrandbits(64) for _ in range(size)) for _ in PIECES
+    )
 
-    def get_board_state(self) -> list:
-        """Returns the current board state as a list of lists"""
-        return self.board
 
-    
-    def drop_piece(self, board: List[List[str]], col: int, piece: str) -> List[List[str]]:
-
-        # Check if the column index is within the valid range
-        if not (0 <= col < self.cols):
-            return board  # Illegal move: column index out of range
+class ConnectFourBoard:
+    """Represents the Connect Four board state and provides utility methods.
+
+    The position is stored as a bitboard: one integer mask per player plus the
+    height of every column. Bits are laid out column by column, bottom to top,
+    with one spare sentinel bit on top of each column so that shifted masks
+    never wrap from one column into the next.
+    """
+
+    def __init__(self, rows: int = 4, cols: int = 4):
+        if rows < 1 or cols < 1:
+            raise ValueError(f"Board dimensions must be positive, got {rows}x{cols}")
+        self.rows = rows
+        self.cols = cols
+        # Bits per column including the sentinel bit
+        self._stride = rows + 1
+        # Shifts for vertical, horizontal and both diagonal directions
+        self._shifts = (1, self._stride, self._stride - 1, self._stride + 1)
+        self._zobrist_keys = zobrist_keys(rows, cols)
+        self.reset_board()
 
-        # Iterate from the bottom row upward to find the first empty slot ('.')
-        for row in reversed(board):
-            if row[col] == ".":
-                row[col] = piece  # Place the piece
-                return board     # Return the updated board
+    def reset_board(self) -> None:
+        """Resets the board to its initial empty state."""
+        self._masks = [0, 0]
+        self._counts = [0, 0]
+        self._heights = [0] * self.cols
+        self._moves: List[Tuple[int, int]] = []  # (col, player index) per ply
+        self._winner = ""
+        self._win_ply = -1
+        # Zobrist hash of the position, updated incrementally on every move
+        self.zobrist = 0
+
+    @property
+    def board(self) -> List[List[str]]:
+        """List-of-lists view of the board, top row first."""
+        return self.get_board_state()
 
-        # If no empty cell is found, the column is full.
-        return board  # Illegal move: column is full, board remains unchanged
- 
+    def get_board_state(self) -> list:
+        """Returns the current board state as a list of lists"""
+        red, yellow = self._masks
+        state = []
+        for row in range(self.rows - 1, -1, -1):
+            line = []
+            for col in range(self.cols):
+                bit = 1 << (col * self._stride + row)
+                line.append("R" if red & bit else "Y" if yellow & bit else EMPTY)
+            state.append(line)
+        return state
+
+    def encode(self) -> str:
+        """Compact single-line encoding for prompts, cache keys and logs.
+
+        Rows are listed top row first and separated by '/', using the same
+        'R', 'Y' and '.' cells as get_board_state(), e.g. '..../..../.Y../RR..'.
+        """
+        return "/".join("".join(row) for row in self.get_board_state())
+
+    @classmethod
+    def decode(cls, encoded: str) -> "ConnectFourBoard":
+        """Rebuilds a board from encode() output; move order is not recoverable."""
+        lines = encoded.strip().split("/")
+        board = cls(len(lines), len(lines[0]))
+        for line in lines:
+            if len(line) != board.cols or set(line) - {"R", "Y", EMPTY}:
+                raise ValueError(f"Invalid board encoding: {encoded!r}")
+        # Replay each column bottom up so gravity holds
+        for row in range(board.rows - 1, -1, -1):
+            for col, cell in enumerate(lines[row]):
+                if cell == EMPTY:
+                    continue
+                if board._heights[col] != board.rows - 1 - row:
+                    raise ValueError(f"Floating piece in column {col}: {encoded!r}")
+                board.drop_piece(col, cell)
+        return board
+
+    def to_base3(self) -> int:
+        """The position as a base-3 integer (0 empty, 1 RED, 2 YELLOW), top-left cell most significant."""
+        value = 0
+        for row in self.get_board_state():
+            for cell in row:
+                value = value * 3 + (0 if cell == EMPTY else 1 if cell == "R" else 2)
+        return value
+
+    @classmethod
+    def from_base3(cls, value: int, rows: int = 4, cols: int = 4) -> "ConnectFourBoard":
+        """Rebuilds a board from to_base3() output; raises ValueError for values that are no rows x cols board."""
+        if not 0 <= value < 3 ** (rows * cols):
+            raise ValueError(f"Base-3 value {value} is out of range for a {rows}x{cols} board")
+        cells = []
+        for _ in range(rows * cols):
+            value, digit = divmod(value, 3)
+            cells.append((EMPTY, "R", "Y")[digit])
+        cells.reverse()
+        return cls.decode("/".join("".join(cells[r * cols:(r + 1) * cols]) for r in range(rows)))
+
+    @property
+    def current_piece(self) -> str:
+        """The piece that moves next. RED starts, then the colours alternate."""
+        return PIECES[0] if self._counts[0] <= self._counts[1] else PIECES[1]
+
+    @property
+    def move_count(self) -> int:
+        return len(self._moves)
+
+    @property
+    def moves(self) -> List[int]:
+        """Columns played so far, in order."""
+        return [col for col, _ in self._moves]
+
+    def legal_moves(self) -> List[int]:
+        """Columns that still have room for a piece."""
+        return [col for col in range(self.cols) if self._heights[col] < self.rows]
+
+    def drop_piece(self, col: int, piece: Optional[str] = None) -> bool:
+        """Drops a piece into a column, defaulting to the side to move.
+
+        Returns False and leaves the board unchanged if the move is illegal.
+        """
+        if not self.is_valid_move(col):
+            return False
+        player = PIECES.index(piece if piece is not None else self.current_piece)
+
+        bit = col * self._stride + self._heights[col]
+        self._masks[player] |= 1 << bit
+        self.zobrist ^= self._zobrist_keys[player][bit]
+        self._heights[col] += 1
+        self._counts[player] += 1
+        self._moves.append((col, player))
+
+        if not self._winner and self._is_win(self._masks[player]):
+            self._winner = PIECES[player]
+            self._win_ply = len(self._moves)
+        return True
+
+    def undo_move(self) -> None:
+        """Takes back the last move."""
+        if not self._moves:
+            raise IndexError("No moves to undo")
+        if len(self._moves) == self._win_ply:
+            self._winner = ""
+            self._win_ply = -1
+        col, player = self._moves.pop()
+        self._heights[col] -= 1
+        self._counts[player] -= 1
+        bit = col * self._stride + self._heights[col]
+        self._masks[player] ^= 1 << bit
+        self.zobrist ^= self._zobrist_keys[player][bit]
 
     def is_valid_move(self, col: int) -> bool:
         """Checks if a move (dropping a piece in a column) is valid."""
-        return 0 <= col < self.cols and self.board[0][col] == "."
+        return 0 <= col < self.cols and self._heights[col] < self.rows
+
+    def _is_win(self, mask: int) -> bool:
+        """Shift-and-mask test for CONNECT pieces in a row on a single player's mask."""
+        for shift in self._shifts:
+            m = mask
+            for _ in range(CONNECT - 1):
+                m &= m >> shift
+                if not m:
+                    break
+            if m:
+                return True
+        return False
 
     def check_winner(self) -> str:
         """Checks the board for a winner. Returns 'R', 'Y', or '' if there's no winner."""
-        # Check horizontal, vertical, and diagonal (both directions)
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # Right, Down, Down-Right, Down-Left
-
-        for row in range(self.rows):
-            for col in range(self.cols):
-                current_piece = self.board[row][col]
-                if current_piece == ".":
-                    continue
-
-                for dr, dc in directions:
-                    count = 1
-                    for i in range(1, 4):
-                        r, c = row + dr * i, col + dc * i
-                        if 0 <= r < self.rows and 0 <= c < self.cols and self.board[r][c] == current_piece:
-                            count += 1
-                        else:
-                            break
-                    if count == 4:
-                        return current_piece
-
-        return ""  # No winner yet
+        return self._winner
 
     def is_full(self) -> bool:
         """Checks if the board is full, indicating a draw."""
-        return all(cell != "." for cell in self.board[0])
-
-    def reset_board(self) -> None:
-        """Resets the board to its initial empty state."""
-        self.board = [["." for _ in range(self.cols)] for _ in range(self.rows)]
+        return len(self._moves) == self.rows * self.cols
@@ -1,17 +1,44 @@
-from typing import Dict, List,Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+import argparse
+import json
 import sys
+import time
+import uuid
 from agno.agent import Agent
-from agno.models.anthropic import Claude
 from agno.utils.log import logger
 from connect4_board import ConnectFourBoard
-from agno.models.openai import OpenAIChat
-import ast
+from connect4_solver import NegamaxPlayer
+from game_records import GameRecord, GameRecordWriter
+from model_clients import GameModels
+from move_protocol import ColumnMove, ask_with_retries, legal_move_model
+from tracing import Tracer, print_report
 
 
 
 class Connect4Game:
-    def __init__(self):
-        self.board = ConnectFourBoard()
+    def __init__(
+        self,
+        rows: int = 4,
+        cols: int = 4,
+        red_player=None,
+        yellow_player=None,
+        model_factory=None,
+        cache=None,
+        recorder=None,
+        tracer=None,
+    ):
+        self.board = ConnectFourBoard(rows, cols)
+        # Local players expose choose_move(board) -> int; None means the LLM agent plays that colour
+        self.players = {"R": red_player, "Y": yellow_player}
+        # Model factory, opt-in CompletionCache and opt-in Tracer for the agents
+        self.models = GameModels(model_factory, cache, tracer)
+        self.tracer = tracer
+        # Opt-in GameRecordWriter that receives the game's record once it finishes
+        self.recorder = recorder
+        self.record = GameRecord(rows, cols, self._player_name("R"), self._player_name("Y"))
+        self._last_move_at = time.perf_counter()
+        self._pending_tokens = 0
+        self.game_id = uuid.uuid4().hex[:12]
         try:
             self.agents = self._initialize_agents()
         except Exception as e:
@@ -21,10 +48,29 @@ class Connect4Game:
        
 
 
+    def reset(self) -> None:
+        """Start a new game with the same agents, so an app can reuse them instead of rebuilding them"""
+        self.board.reset_board()
+        self.record = GameRecord(self.board.rows, self.board.cols, self.record.red, self.record.yellow)
+        self.game_id = uuid.uuid4().hex[:12]
+        self._pending_tokens = 0
+        self._last_move_at = time.perf_counter()
+        for agent in self.agents.values():
+            if agent.memory is not None:
+                agent.memory.clear()
+
+    def _player_name(self, piece: str) -> str:
+        player = self.players[piece]
+        return "llm" if player is None else getattr(player, "name", type(player).__name__)
+
     def _initialize_agents(self) -> Dict[str, Agent]:
         """Initialize all required agents for Connect Four with specific roles"""
        
         try:
+            red_model = self.models.player_model()
+            yellow_model = self.models.player_model()
+            master_model = self.models.new_model()
+
             # move_generator_agent = Agent(
             #     name="move_generator_agent",
             #     role="""You are a Connect Four rules expert. Given a board state which will be a 4x4 matrix, list ALL legal moves.
@@ -42,8 +88,11 @@ class Connect4Game:
                     - Looking for a good move.
                     - Creating good paths
                     - Enusre you are only playing legal moves
-                    Respond with the chosen column number (0-3) and why you chose it.""",
-                model=OpenAIChat(id="gpt-4o"),
+                    The board is written as rows from top to bottom separated by '/', with 'R' for RED, 'Y' for YELLOW and '.' for empty.
+                    Respond with the column you choose and a one-sentence reason.""",
+                model=red_model,
+                response_model=legal_move_model(tuple(range(self.board.cols))),
+                telemetry=self.models.telemetry(red_model),
                 # debug_mode=True,
             )
 
@@ -59,119 +108,248 @@ class Connect4Game:
                     - Try to trick the other player if you can but ensure to take the win if there is chance
                     - Enusre you are only playing legal moves
                     - Analyse the board carefully for best move but make sure it is legal.
-                    Respond with the chosen column number (0-3) and why you chose it.""",
-               model=OpenAIChat(id="gpt-4o"),
-                # debug_mode=True,
-            )
-            
-            board_state_manager = Agent(
-                name="board_state_manager",
-                role="""
-                        You are a specialist in maintaining and modifying the board state for a Connect 4 game played between two players. Your primary responsibility is to ensure that every move is executed exactly as it would be in a real Connect 4 game. 
-                        Key responsibilities include:
-                        1. **Piece Insertion:** When a player makes a move, you will insert the player piece into the specified column. Pieces must always "fall" to the lowest available slot in that column. For example, if a column is empty, you cannot have a token in the middle, it will only get inserted to the bottom most space. 
-                        2. **Board Representation:** The board is represented as a 2D list (a list of lists). Each cell in the board is either empty (denoted by '.') or contains a player's piece (for example, 'Y' for Yellow or 'R' for Red). The board dimensions are defined by a given number of rows and columns.
-                        3. **Legal Moves Only:** Before inserting a piece, verify that the column is within range and has at least one empty slot. If the column is full or the column index is invalid, do not change the board state.
-                        4. **State Persistence:** Ensure that the board state is correctly maintained and updated across moves.
-                        5. **Feedback:** After processing a move, output the updated board state. If a move is illegal, indicate the error and leave the board state unchanged.
-                        """,
-               model=OpenAIChat(id="gpt-4o"),
-                # debug_mode=True,
-            )
-            
-            result_checker = Agent(
-                name="result_checker",
-                role="""
-                    You are a specialist in analyzing the board state for a Connect 4 game played between two players. 
-                    Your primary responsibility is to determine if there is a winner or if the game has resulted in a draw after each move.
-
-                    **Key Responsibilities:**
-                    1. **Winner Detection:** Analyze the current board state to identify if any player has won. A win is defined as four of the same player's pieces ('Y' for Yellow or 'R' for Red) consecutively aligned either horizontally, vertically, or diagonally (both left-to-right and right-to-left).
-
-                    2. **Draw Detection:** Determine if the game has resulted in a draw. A draw occurs when all slots on the board are filled, and no player has achieved four consecutive pieces in any direction.
-
-                    3. **Board Representation:** The board is represented as a 2D list (a list of lists). Each cell in the board is either empty (denoted by '.') or contains a player's piece ('Y' or 'R').
-
-                    4. **Accurate Evaluation:** Ensure that your analysis is based solely on the provided board state without modifying it. You do not insert, remove, or alter any pieces on the board.
-
-                    5. **Clear Feedback:** After analyzing the board:
-                        - Indicate if there is a winner, specifying which player ('Y' or 'R') has won.
-                        - If the game is a draw, clearly state that it is a draw.
-                        - If the game is still ongoing with no winner or draw, indicate that the game should continue.
-                """,
-                model=OpenAIChat(id="gpt-4o"),
+                    The board is written as rows from top to bottom separated by '/', with 'R' for RED, 'Y' for YELLOW and '.' for empty.
+                    Respond with the column you choose and a one-sentence reason.""",
+                model=yellow_model,
+                response_model=legal_move_model(tuple(range(self.board.cols))),
+                telemetry=self.models.telemetry(yellow_model),
                 # debug_mode=True,
             )
             
             master_agent = Agent(
                 name="master_agent",
                 role="""
-                    You are the master agent overseeing the Connect Four game. Your primary objective is to coordinate the game flow using the following agents:
-                    - **player_red_agent**: Selects moves for the RED player.
-                    - **player_yellow_agent**: Selects moves for the YELLOW player.
-                    - **board_state_manager**: Updates the board state based on the player's chosen move, following the rules of Connect Four (gravity rules).
-                    - **result_checker**: Analyzes the board after each move to determine if there's a winner or a draw.
+                    You are the master agent overseeing the Connect Four game. Your primary objective is to coordinate the game flow using the following tools:
+                    - **request_move**: Asks the RED or YELLOW player agent for its move. It always returns a legal column and the player's reason.
+                    - **drop_piece**: Drops a player's piece into a column following the rules of Connect Four (gravity rules) and returns the updated board.
+                    - **is_valid_move**: Checks whether a column can take another piece.
+                    - **check_winner**: Reports whether RED or YELLOW has four in a row.
+                    - **is_full**: Reports whether the board is full, which is a tie when there is no winner.
+                    Tools describe the board as rows from top to bottom separated by '/', with 'R' for RED, 'Y' for YELLOW and '.' for empty.
 
                     **Key Responsibilities:**
                     1. **Turn Management:** Alternate turns between the RED and YELLOW agents, starting with the RED player.
                     2. **Clear Commentary:** Provide clear, step-by-step commentary after every move, including which player made the move, which column was chosen, and any important updates.
                     3. **Board Display:** After every move, output the current board state in a clear, tabular format to reflect the updated game status.
-                    4. **Move Validation:** When an agent selects a column, validate the move to ensure it's legal (i.e., the column is within bounds and not full). Clearly indicate if a move is invalid.
-                    5. **Board Update:** After validating the move, send the move to the **board_state_manager** to get the updated board state according to the game rules.
-                    6. **Game Progression:** Provide both the current board state and the list of legal moves to the current player’s agent to assist in move selection.
-                    7. **Win/Draw Checking:** After every move, send the updated board to the **result_checker** to verify if there’s a winner or if the game has ended in a draw. Clearly announce the result of each check.
-                    8. **Game Continuity:** Do not stop the game until the **result_checker** explicitly declares a winner or a draw.
-                    9. **Clear Outcomes:** At the end of the game, respond with one of the following:
+                    4. **Move Selection:** Get the current player's move with the **request_move** tool. Its moves are already validated against the board.
+                    5. **Board Update:** Apply the move with the **drop_piece** tool to get the updated board state according to the game rules.
+                    6. **Win/Draw Checking:** After every move, use the **check_winner** and **is_full** tools to verify if there’s a winner or if the game has ended in a draw. Clearly announce the result of each check.
+                    7. **Game Continuity:** Do not stop the game until **check_winner** reports a winner or **is_full** reports a full board.
+                    8. **Clear Outcomes:** At the end of the game, respond with one of the following:
                     - `"WINNER - RED"` if the RED player wins.
                     - `"WINNER - YELLOW"` if the YELLOW player wins.
                     - `"TIE"` if the board is full with no winner.
-                    10. **Consistent Board Updates:** Always output the board state in a tabular format after every move, validation, and result check for clarity.
 
                     **Important Rules:**
                     - The game starts with an empty board, and RED makes the first move.
                     - Tokens must follow the laws of gravity—they fall to the lowest available slot in the selected column.
-                    - If an agent selects an invalid move (e.g., full column), prompt the same agent to select another move without switching turns.
-                    - The master agent is strictly responsible for coordination and should not modify the board directly; always rely on the **board_state_manager** for board updates.
-                    - The game only ends when the **result_checker** declares a winner or a tie.
+                    - The master agent is strictly responsible for coordination and should not edit the board by hand; always rely on the **drop_piece** tool for board updates.
+                    - The game only ends when the tools report a winner or a tie.
                     - Do not end the game if there is no winner or a draw.
                 """,
                 instructions=[
-                    "1. Coordinate the Connect Four game by managing turns between RED and YELLOW agents, starting with RED.",
+                    "1. Coordinate the Connect Four game by managing turns between RED and YELLOW, starting with RED.",
                     "2. **After each move, clearly announce which player made the move and the column they chose.**",
-                    "3. **Always output the board state in a clear, tabular format after each move and after important events.**",
-                    "4. Provide the current board state and legal moves to the current player's agent to assist in move selection.",
-                    "5. When a player selects a move, validate it to ensure the column is within bounds and not full. Clearly indicate if a move is invalid.",
-                    "6. Use the **board_state_manager** agent to apply the move and receive the updated board state.",
-                    "7. After updating the board, send the current board to the **result_checker** to determine if there’s a winner or a tie. Clearly announce the result of each check.",
-                    "8. If the move is invalid, prompt the same player to make another move without switching turns.",
-                    "9. Continue alternating turns and checking for a result until the **result_checker** declares a winner or a tie.",
-                    "10. Clearly announce the final result with either 'WINNER - RED', 'WINNER - YELLOW', or 'TIE' at the end of the game.",
-                    "11. **Ensure the board state is displayed in a tabular format after every step, including move selections, board updates, and result checks.**"
+                    "3. **Output the board state in a clear, tabular format after each move.**",
+                    "4. Use the **request_move** tool to get the current player's move.",
+                    "5. Use the **drop_piece** tool to apply the move and receive the updated board state.",
+                    "6. After updating the board, use the **check_winner** and **is_full** tools to determine if there’s a winner or a tie. Clearly announce the result of each check.",
+                    "7. Continue alternating turns and checking for a result until the tools report a winner or a tie.",
+                    "8. Clearly announce the final result with either 'WINNER - RED', 'WINNER - YELLOW', or 'TIE' at the end of the game."
                 ],
-                model=OpenAIChat(id="gpt-4o"),
+                model=master_model,
+                telemetry=self.models.telemetry(master_model),
                 markdown=True,
-                team=[player_red_agent, player_yellow_agent, board_state_manager, result_checker],
+                tools=self._board_tools(),
                 show_tool_calls=True,
             )
 
 
-            return {
+            agents = {
                 "red": player_red_agent,
                 "yellow": player_yellow_agent,
-                "manager":board_state_manager,
-                "checker":result_checker,
                 # "move_generator": move_generator_agent,
                 "master": master_agent,
             }
+            self.models.trace(agents)
+            return agents
         except Exception as e:
             logger.error(f"Error initializing agents: {str(e)}")
             raise
 
 
+    def _board_tools(self) -> List[Callable]:
+        """Board operations exposed to the master agent as function tools, bound to this game's board"""
+        board = self.board
+
+        def request_move(piece: str) -> str:
+            """Ask a player agent for its next move.
+
+            Args:
+                piece (str): 'R' for RED or 'Y' for YELLOW. Must be the player whose turn it is.
+
+            Returns:
+                str: JSON with the chosen legal column and the player's reason, or an error once the game is over.
+            """
+            if board.check_winner() or board.is_full():
+                return json.dumps({"error": "The game is over"})
+            if piece != board.current_piece:
+                return json.dumps({"error": f"It is {board.current_piece}'s turn"})
+            try:
+                return self._ask_agent(piece).model_dump_json()
+            except ValueError as e:
+                return json.dumps({"error": str(e)})
+
+        def board_status() -> Dict[str, Union[list, str, bool]]:
+            return {
+                "board": board.encode(),
+                "legal_moves": board.legal_moves(),
+                "next_player": board.current_piece,
+                "winner": board.check_winner(),
+                "is_full": board.is_full(),
+            }
+
+        def drop_piece(column: int, piece: str) -> str:
+            """Drop a piece into a column. The piece falls to the lowest empty slot.
+
+            Args:
+                column (int): The column to play, starting at 0.
+                piece (str): 'R' for RED or 'Y' for YELLOW. Must be the player whose turn it is.
+
+            Returns:
+                str: JSON with the updated board, legal moves, next player, winner and whether the board is full,
+                or an error if the move was rejected, including after the game is over, and the board is unchanged.
+            """
+            column = int(column)
+            if board.check_winner() or board.is_full():
+                return json.dumps({"error": "The game is over", **board_status()})
+            if piece != board.current_piece:
+                return json.dumps({"error": f"It is {board.current_piece}'s turn", **board_status()})
+            try:
+                self._apply_move(piece, column)
+            except ValueError:
+                return json.dumps({"error": f"Column {column} is not a legal move", **board_status()})
+            return json.dumps(board_status())
+
+        def is_valid_move(column: int) -> str:
+            """Check whether a piece can be dropped into a column.
+
+            Args:
+                column (int): The column to check, starting at 0.
+
+            Returns:
+                str: 'true' if the column is within bounds and not full, otherwise 'false'.
+            """
+            return json.dumps(board.is_valid_move(int(column)))
+
+        def check_winner() -> str:
+            """Check the board for four in a row.
+
+            Returns:
+                str: 'R' if RED has won, 'Y' if YELLOW has won, or an empty string if there is no winner yet.
+            """
+            return board.check_winner()
+
+        def is_full() -> str:
+            """Check whether every slot on the board is filled.
+
+            Returns:
+                str: 'true' if the board is full, otherwise 'false'.
+            """
+            return json.dumps(board.is_full())
+
+        return [request_move, drop_piece, is_valid_move, check_winner, is_full]
+
+    def _move_prompt(self, error: str = "") -> str:
+        prompt = f"Board: {self.board.encode()}\nLegal moves: {self.board.legal_moves()}"
+        if error:
+            prompt += f"\nYour previous reply was rejected ({error}). Choose one of the legal moves."
+        return prompt
+
+    def _prepare_move_request(self, piece: str) -> Tuple[Agent, Type[ColumnMove]]:
+        """The player's agent, with its response schema narrowed to the legal columns"""
+        agent = self.agents["red" if piece == "R" else "yellow"]
+        agent.response_model = legal_move_model(tuple(self.board.legal_moves()))
+        return agent, agent.response_model
+
+    def _annotate(self, attempt: int = 1) -> None:
+        """Tag the agent calls that follow with this game, move and attempt when tracing"""
+        if self.tracer is not None:
+            self.tracer.annotate(game="connect4", game_id=self.game_id, move=self.board.move_count + 1, attempt=attempt)
+
+    def _ask_agent(self, piece: str, attempts: int = 2, run: Optional[Callable[[Agent, str], Any]] = None):
+        """Ask the LLM player agent for a ColumnMove, validated locally against the legal columns.
+
+        `run(agent, prompt)` sends the prompt, by default with agent.run; an
+        async `run` makes this return a coroutine, as in AsyncConnect4Game.
+        """
+        agent, move_model = self._prepare_move_request(piece)
+        run = run or (lambda agent, prompt: agent.run(prompt))
+
+        def request(error: str, attempt: int):
+            self._annotate(attempt)
+            return run(agent, self._move_prompt(error))
+
+        return ask_with_retries(request, move_model, agent.name, attempts, on_response=self._count_tokens)
+
+    def _count_tokens(self, response) -> None:
+        self._pending_tokens += self._response_tokens(response)
+
+    @staticmethod
+    def _response_tokens(response) -> int:
+        metrics = response.metrics or {}
+        return sum(metrics.get("input_tokens", [])) + sum(metrics.get("output_tokens", []))
+
+    def _apply_move(self, piece: str, col: int, on_move: Optional[Callable[[str, int], None]] = None) -> str:
+        """Play a chosen column and return the game result, or '' while the game goes on"""
+        if not self.board.drop_piece(col, piece):
+            raise ValueError(f"Player {piece} chose illegal column {col}")
+        now = time.perf_counter()
+        self.record.add_move(col, now - self._last_move_at, self._pending_tokens)
+        self._last_move_at = now
+        self._pending_tokens = 0
+        if on_move is not None:
+            on_move(piece, col)
+
+        winner = self.board.check_winner()
+        if winner:
+            result = "WINNER - RED" if winner == "R" else "WINNER - YELLOW"
+        elif self.board.is_full():
+            result = "TIE"
+        else:
+            return ""
+        self._finish_record(result)
+        return result
+
+    def _finish_record(self, result: str) -> None:
+        """Close the record and hand it to the recorder; later calls for the same game do nothing"""
+        if self.record.result:
+            return
+        self.record.result = result
+        self.record.duration = sum(self.record.latencies)
+        if self.recorder is not None:
+            self.recorder.write(self.record)
+
+    def play(self, on_move: Optional[Callable[[str, int], None]] = None) -> str:
+        """Play a full game driven from Python, asking local players or LLM agents for each move"""
+        self._last_move_at = time.perf_counter()
+        result = ""
+        while not result:
+            piece = self.board.current_piece
+            player = self.players[piece]
+            col = player.choose_move(self.board) if player is not None else self._ask_agent(piece).column
+            result = self._apply_move(piece, col, on_move)
+        return result
+
     def start_game(self):
         """Start and manage the Connect Four game"""
+        if any(player is not None for player in self.players.values()):
+            return self._start_local_game()
+
         try:
-            initial_state = self.board.get_board_state()
+            initial_state = self.board.encode()
+            self._last_move_at = time.perf_counter()
+            self._annotate()
             response = self.agents["master"].print_response(
                 f"New Connect Four game started. Current board state:\n{initial_state}\n"
                 "Keep playing until there is a winner. Red plays first, then yellow and they keep switching.",
@@ -186,14 +364,73 @@ class Connect4Game:
         except Exception as e:
             print(f"Error starting game: {str(e)}")
             raise
-        
+
+    def _start_local_game(self) -> str:
+        """Run the game loop in-process when at least one colour is played by a local player"""
+        def print_move(piece: str, col: int) -> None:
+            print(f"{'RED' if piece == 'R' else 'YELLOW'} plays column {col}")
+            for row in self.board.get_board_state():
+                print(" ".join(row))
+            print()
+
+        try:
+            result = self.play(on_move=print_move)
+            print(result)
+            return result
+        except Exception as e:
+            print(f"Error starting game: {str(e)}")
+            raise
+
+PLAYER_CHOICES = ("llm", "solver", "weak", "mcts")
+
+
+def create_player(kind: str, seed: Optional[int] = None, time_limit: Optional[float] = None):
+    """Build a player by name; 'llm' returns None so the colour is played by its agent"""
+    if kind == "llm":
+        return None
+    if kind == "solver":
+        player = NegamaxPlayer(seed=seed)
+    elif kind == "weak":
+        player = NegamaxPlayer.weak(seed=seed)
+    elif kind == "mcts":
+        # Imported here so the NumPy import is only paid for when MCTS plays
+        from connect4_mcts import MCTSPlayer
+
+        # The budget goes through the constructor, which rejects a search with none
+        return MCTSPlayer(seed=seed) if time_limit is None else MCTSPlayer(time_limit=time_limit, seed=seed)
+    else:
+        raise ValueError(f"Unknown player type: {kind}")
+    if time_limit is not None:
+        player.time_limit = time_limit
+    return player
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Play a game of Connect Four")
+    parser.add_argument("--red", choices=PLAYER_CHOICES, default="llm", help="Player for RED")
+    parser.add_argument("--yellow", choices=PLAYER_CHOICES, default="llm", help="Player for YELLOW")
+    parser.add_argument("--record", help="Append the finished game to this record file (.jsonl, or .bin for binary)")
+    parser.add_argument("--trace", help="Write agent call traces to this file (.jsonl, or .prom for OpenMetrics)")
+    args = parser.parse_args()
+    recorder = GameRecordWriter(args.record) if args.record else None
+    tracer = Tracer(args.trace) if args.trace else None
     try:
-        game = Connect4Game()
+        game = Connect4Game(
+            red_player=create_player(args.red),
+            yellow_player=create_player(args.yellow),
+            recorder=recorder,
+            tracer=tracer,
+        )
+        game.record.red, game.record.yellow = args.red, args.yellow
         game.start_game()
     except Exception as e:
         print(f"Fatal error: {str(e)}")
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if tracer is not None:
+            tracer.close()
+            print_report(tracer.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+import math
+import random
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from connect4_batch import RED, YELLOW, BatchConnectFourBoard
+from connect4_board import PIECES, ConnectFourBoard
+
+
+class MCTSNode:
+    """A position in the search tree, reached when `player` (0 RED, 1 YELLOW) played `move`"""
+
+    __slots__ = ("parent", "move", "player", "children", "untried", "visits", "wins")
+
+    def __init__(self, parent: Optional["MCTSNode"], move: int, player: int, untried: List[int]):
+        self.parent = parent
+        self.move = move
+        self.player = player
+        self.children: Dict[int, "MCTSNode"] = {}
+        self.untried = untried
+        self.visits = 0
+        # Wins for `player` over all playouts through this node; draws count half
+        self.wins = 0.0
+
+    def uct_child(self, exploration: float) -> "MCTSNode":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_visits / c.visits),
+        )
+
+
+class MCTSPlayer:
+    """Local Connect Four player using Monte Carlo tree search with UCT.
+
+    Each iteration walks the tree by UCT, expands one new move and scores it
+    with random playouts. The budget is `playouts` rollouts, `time_limit`
+    seconds, or whichever runs out first when both are set; a falsy
+    `time_limit` means no time budget, which needs `playouts`. `rollout_batch`
+    playouts per leaf are run together on a BatchConnectFourBoard, which pays
+    off on larger boards. With `workers` > 1 the search is root-parallel: extra
+    worker processes grow independent trees from the same position and their
+    root visit counts are summed with this process's tree. The subtree under
+    the move played is kept for the next call when the game continues from it.
+    """
+
+    def __init__(
+        self,
+        playouts: Optional[int] = None,
+        time_limit: float = 1.0,
+        exploration: float = math.sqrt(2),
+        rollout_batch: int = 1,
+        workers: int = 1,
+        reuse_tree: bool = True,
+        seed: Optional[int] = None,
+    ):
+        if playouts is None and not time_limit:
+            raise ValueError("MCTSPlayer needs a budget: set playouts, a positive time_limit, or both")
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rollout_batch = rollout_batch
+        self.workers = workers
+        self.reuse_tree = reuse_tree
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.iterations = 0
+        self._root: Optional[MCTSNode] = None
+        self._root_moves: List[int] = []
+        self._root_dims: Optional[Tuple[int, int]] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def choose_move(self, board: ConnectFourBoard) -> int:
+        """Returns the column to play for the side to move on `board`."""
+        legal = board.legal_moves()
+        if not legal:
+            raise ValueError("No legal moves available")
+        if len(legal) == 1:
+            return legal[0]
+
+        futures: List[Future] = []
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers - 1)
+            budget = (self.playouts, self.time_limit, self.exploration, self.rollout_batch)
+            futures = [
+                self._pool.submit(_search_worker, board.encode(), budget, self.rng.getrandbits(32))
+                for _ in range(self.workers - 1)
+            ]
+
+        root = self._reused_root(board)
+        self.search(board, root)
+        visits = {col: child.visits for col, child in root.children.items()}
+        for future in futures:
+            for col, count in future.result().items():
+                visits[col] = visits.get(col, 0) + count
+
+        move = max(visits, key=visits.get)
+        if self.reuse_tree and move in root.children:
+            self._root = root.children[move]
+            self._root_moves = board.moves + [move]
+            self._root_dims = (board.rows, board.cols)
+        return move
+
+    def _reused_root(self, board: ConnectFourBoard) -> MCTSNode:
+        """The stored subtree for this position if the game continued from it, otherwise a fresh root"""
+        moves = board.moves
+        node = None
+        if (
+            self.reuse_tree
+            and self._root is not None
+            and self._root_dims == (board.rows, board.cols)
+            and moves[:len(self._root_moves)] == self._root_moves
+        ):
+            node = self._root
+            for col in moves[len(self._root_moves):]:
+                node = node.children.get(col)
+                if node is None:
+                    break
+        if node is None:
+            node = MCTSNode(None, -1, 1 - PIECES.index(board.current_piece), board.legal_moves())
+        node.parent = None
+        return node
+
+    def search(self, board: ConnectFourBoard, root: MCTSNode) -> MCTSNode:
+        """Grow the tree under `root`, the node for `board`, until the budget is spent; `board` is restored afterwards"""
+        deadline = time.perf_counter() + self.time_limit if self.time_limit else math.inf
+        playouts = 0
+        self.iterations = 0
+        while (self.playouts is None or playouts < self.playouts) and (
+            playouts == 0 or time.perf_counter() < deadline
+        ):
+            node, depth = root, 0
+            # Selection
+            while not node.untried and node.children:
+                node = node.uct_child(self.exploration)
+                board.drop_piece(node.move)
+                depth += 1
+            # Expansion
+            if node.untried and not board.check_winner():
+                col = node.untried.pop(self.rng.randrange(len(node.untried)))
+                player = PIECES.index(board.current_piece)
+                board.drop_piece(col)
+                depth += 1
+                untried = [] if board.check_winner() else board.legal_moves()
+                node.children[col] = node = MCTSNode(node, col, player, untried)
+            # Simulation
+            n, red_wins, yellow_wins = self._rollout(board)
+            # Backpropagation
+            while node is not None:
+                node.visits += n
+                own, other = (red_wins, yellow_wins) if node.player == 0 else (yellow_wins, red_wins)
+                node.wins += own + 0.5 * (n - own - other)
+                node = node.parent
+            for _ in range(depth):
+                board.undo_move()
+            playouts += n
+            self.iterations += 1
+        return root
+
+    def _rollout(self, board: ConnectFourBoard) -> Tuple[int, int, int]:
+        """Random playouts from `board`; returns (playouts, RED wins, YELLOW wins)"""
+        winner = board.check_winner()
+        if winner or board.is_full():
+            n = self.rollout_batch
+            return n, n if winner == PIECES[0] else 0, n if winner == PIECES[1] else 0
+
+        if self.rollout_batch > 1:
+            batch = BatchConnectFourBoard.repeat(board, self.rollout_batch)
+            winners = batch.playout(self.np_rng)
+            return self.rollout_batch, int((winners == RED).sum()), int((winners == YELLOW).sum())
+
+        plies = 0
+        while not board.check_winner() and not board.is_full():
+            board.drop_piece(self.rng.choice(board.legal_moves()))
+            plies += 1
+        winner = board.check_winner()
+        for _ in range(plies):
+            board.undo_move()
+        return 1, int(winner == PIECES[0]), int(winner == PIECES[1])
+
+    def close(self) -> None:
+        """Shut down the worker processes used for root parallelism"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def _search_worker(encoded: str, budget: tuple, seed: int) -> Dict[int, int]:
+    """Root-parallel search in a worker process; returns the visit count of every root move"""
+    playouts, time_limit, exploration, rollout_batch = budget
+    player = MCTSPlayer(playouts, time_limit, exploration, rollout_batch, reuse_tree=False, seed=seed)
+    board = ConnectFourBoard.decode(encoded)
+    root = player.search(board, player._reused_root(board))
+    return {col: child.visits for col, child in root.children.items()}
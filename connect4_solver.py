@@ -0,0 +1,177 @@
+import random
+import time
+from typing import List, Optional
+
+from connect4_board import CONNECT, PIECES, ConnectFourBoard
+from connect4_transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+
+WIN_SCORE = 1_000_000
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the per-move time budget runs out"""
+
+
+class NegamaxPlayer:
+    """Local Connect Four player using negamax with alpha-beta pruning.
+
+    The search runs with iterative deepening until either `max_depth` is
+    reached or `time_limit` seconds have passed; the best move of the last
+    completed depth is played. `noise` is the probability of playing a random
+    legal move instead of the searched one, which is how the weak setting
+    imitates an average player. Positions reached through different move
+    orders are shared through a Zobrist-keyed transposition table capped at
+    `tt_bytes` (0 disables it).
+    """
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        time_limit: float = 1.0,
+        noise: float = 0.0,
+        seed: Optional[int] = None,
+        tt_bytes: int = 4 * 1024 * 1024,
+    ):
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.noise = noise
+        self.rng = random.Random(seed)
+        self.tt = TranspositionTable(tt_bytes) if tt_bytes else None
+        self.nodes = 0
+        self._deadline = 0.0
+        self._windows: List[int] = []
+        self._dims = None
+
+    @classmethod
+    def weak(cls, seed: Optional[int] = None) -> "NegamaxPlayer":
+        """A shallow, noisy player for the 'average player' RED role."""
+        return cls(max_depth=2, time_limit=0.05, noise=0.25, seed=seed)
+
+    def choose_move(self, board: ConnectFourBoard) -> int:
+        """Returns the column to play for the side to move on `board`."""
+        legal = board.legal_moves()
+        if not legal:
+            raise ValueError("No legal moves available")
+        if self.noise and self.rng.random() < self.noise:
+            return self.rng.choice(legal)
+
+        self._prepare(board)
+        self.nodes = 0
+        self._deadline = time.perf_counter() + self.time_limit
+        if self.tt is not None:
+            self.tt.new_search()
+        max_depth = self.max_depth or board.rows * board.cols - board.move_count
+
+        best_move = self._ordered(board, legal)[0]
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self._search_root(board, depth)
+            except SearchTimeout:
+                break
+            best_move = move
+            if abs(score) >= WIN_SCORE - board.rows * board.cols:
+                break  # Forced result found, deeper search cannot change it
+        return best_move
+
+    def _prepare(self, board: ConnectFourBoard) -> None:
+        """Precomputes the bit mask of every line of CONNECT cells for the board size."""
+        dims = (board.rows, board.cols)
+        if self._dims == dims:
+            return
+        self._dims = dims
+        stride = board.rows + 1
+        self._windows = []
+        for col in range(board.cols):
+            for row in range(board.rows):
+                for dc, dr in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                    end_col, end_row = col + dc * (CONNECT - 1), row + dr * (CONNECT - 1)
+                    if not (0 <= end_col < board.cols and 0 <= end_row < board.rows):
+                        continue
+                    mask = 0
+                    for i in range(CONNECT):
+                        mask |= 1 << ((col + dc * i) * stride + row + dr * i)
+                    self._windows.append(mask)
+
+    def _ordered(self, board: ConnectFourBoard, moves: List[int], first: int = -1) -> List[int]:
+        """Stored best move, then center columns first, so alpha-beta cuts off much earlier."""
+        center = (board.cols - 1) / 2
+        return sorted(moves, key=lambda col: -1 if col == first else abs(col - center))
+
+    def _evaluate(self, board: ConnectFourBoard) -> int:
+        """Heuristic score for the side to move from open lines of CONNECT cells."""
+        player = PIECES.index(board.current_piece)
+        own, opp = board._masks[player], board._masks[1 - player]
+        score = 0
+        for window in self._windows:
+            mine, theirs = window & own, window & opp
+            if mine and not theirs:
+                score += 4 ** (bin(mine).count("1") - 1)
+            elif theirs and not mine:
+                score -= 4 ** (bin(theirs).count("1") - 1)
+        return score
+
+    def _search_root(self, board: ConnectFourBoard, depth: int):
+        best_score, best_move = -WIN_SCORE - 1, None
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        entry = self.tt.probe(board.zobrist) if self.tt is not None else None
+        for col in self._ordered(board, board.legal_moves(), entry.move if entry else -1):
+            board.drop_piece(col)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha)
+            finally:
+                board.undo_move()
+            if score > best_score:
+                best_score, best_move = score, col
+            alpha = max(alpha, score)
+        if self.tt is not None:
+            self.tt.store(board.zobrist, depth, EXACT, best_score, best_move)
+        return best_score, best_move
+
+    def _negamax(self, board: ConnectFourBoard, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        if board.check_winner():
+            # The previous mover won; prefer quicker wins and slower losses
+            return -(WIN_SCORE - board.move_count)
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return self._evaluate(board)
+
+        alpha_orig = alpha
+        tt_move = -1
+        if self.tt is not None:
+            entry = self.tt.probe(board.zobrist)
+            if entry is not None:
+                tt_move = entry.move
+                if entry.depth >= depth:
+                    if entry.flag == EXACT:
+                        return entry.score
+                    if entry.flag == LOWER:
+                        alpha = max(alpha, entry.score)
+                    else:
+                        beta = min(beta, entry.score)
+                    if alpha >= beta:
+                        return entry.score
+
+        best, best_move = -WIN_SCORE - 1, -1
+        for col in self._ordered(board, board.legal_moves(), tt_move):
+            board.drop_piece(col)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha)
+            finally:
+                board.undo_move()
+            if score > best:
+                best, best_move = score, col
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if self.tt is not None:
+            flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+            self.tt.store(board.zobrist, depth, flag, best, best_move)
+        return best
@@ -0,0 +1,101 @@
+from array import array
+from typing import Dict, NamedTuple, Optional
+
+
+# Bound types stored with each entry; 0 marks an empty slot
+EXACT = 1
+LOWER = 2
+UPPER = 3
+
+# keys (8) + scores (4) + depths (1) + flags (1) + moves (1) + ages (1)
+ENTRY_BYTES = 16
+
+
+class TTEntry(NamedTuple):
+    depth: int
+    flag: int
+    score: int
+    move: int
+
+
+class TranspositionTable:
+    """Fixed-size transposition table keyed by Zobrist hashes.
+
+    Entries live in parallel typed arrays sized from `max_bytes`, so memory use
+    is bounded and known up front. A slot is replaced when it is empty, holds
+    the same position, was written during an earlier search, or was searched
+    to a depth no greater than the new entry (depth-preferred replacement).
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.size = max(1, max_bytes // ENTRY_BYTES)
+        self._age = 0
+        self._allocate()
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def _allocate(self) -> None:
+        self._keys = array("Q", bytes(8 * self.size))
+        self._scores = array("i", bytes(4 * self.size))
+        self._depths = array("b", bytes(self.size))
+        self._flags = array("b", bytes(self.size))
+        self._moves = array("b", bytes(self.size))
+        self._ages = array("B", bytes(self.size))
+
+    def new_search(self) -> None:
+        """Marks existing entries as stale so the next search may replace them."""
+        self._age = (self._age + 1) & 0xFF
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Returns the stored entry for `key`, or None on a miss."""
+        index = key % self.size
+        if self._flags[index] and self._keys[index] == key:
+            self.hits += 1
+            return TTEntry(self._depths[index], self._flags[index], self._scores[index], self._moves[index])
+        if self._flags[index]:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: int, move: int = -1) -> None:
+        index = key % self.size
+        if self._flags[index]:
+            same = self._keys[index] == key
+            if not same and self._ages[index] == self._age and self._depths[index] > depth:
+                return
+            if not same:
+                self.overwrites += 1
+        self._keys[index] = key
+        self._scores[index] = score
+        self._depths[index] = min(depth, 127)
+        self._flags[index] = flag
+        self._moves[index] = move
+        self._ages[index] = self._age
+        self.stores += 1
+
+    def clear(self) -> None:
+        self._allocate()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.size * ENTRY_BYTES
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for sizing the table: hits, misses, collisions, stores and fill rate."""
+        lookups = self.hits + self.misses
+        used = self.size - self._flags.count(0)
+        return {
+            "size": self.size,
+            "memory_bytes": self.memory_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "fill_rate": used / self.size,
+        }
@@ -0,0 +1,95 @@
+import asyncio
+import itertools
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+
+@dataclass
+class FakeModel(Model):
+    """Offline stand-in for a chat model, for tests and benchmarks.
+
+    Replies come from `responses` (cycled in order) or from `responder`, which
+    receives the text of the last user message. Every call sleeps for
+    `latency` seconds to imitate a network round trip, and token usage is
+    estimated at four characters per token. Agents built on it pass
+    telemetry=False; agno still needs AGNO_TELEMETRY=false to report nothing.
+    """
+
+    id: str = "fake"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+    responses: Optional[List[str]] = None
+    responder: Optional[Callable[[str], str]] = None
+    latency: float = 0.0
+    calls: int = 0
+    telemetry: bool = False
+    _cycle: Optional[Iterator[str]] = field(default=None, repr=False)
+
+    def _reply(self, messages: List[Message]) -> str:
+        self.calls += 1
+        if self.responder is not None:
+            prompt = next((m.get_content_string() for m in reversed(messages) if m.role == "user"), "")
+            return self.responder(prompt)
+        if self.responses:
+            if self._cycle is None:
+                self._cycle = itertools.cycle(self.responses)
+            return next(self._cycle)
+        return "OK"
+
+    def _assistant_message(self, messages: List[Message], content: str) -> Message:
+        prompt_chars = sum(len(m.get_content_string()) for m in messages)
+        message = Message(role="assistant", content=content)
+        message.metrics = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": len(content) // 4,
+            "time": self.latency,
+        }
+        messages.append(message)
+        return message
+
+    def invoke(self, messages: List[Message]) -> str:
+        time.sleep(self.latency)
+        return self._reply(messages)
+
+    async def ainvoke(self, messages: List[Message]) -> str:
+        await asyncio.sleep(self.latency)
+        return self._reply(messages)
+
+    def invoke_stream(self, messages: List[Message]) -> Iterator[str]:
+        content = self.invoke(messages)
+        yield from re.split(r"(?<= )", content)
+
+    async def ainvoke_stream(self, messages: List[Message]) -> AsyncIterator[str]:
+        content = await self.ainvoke(messages)
+        for word in re.split(r"(?<= )", content):
+            yield word
+
+    def response(self, messages: List[Message]) -> ModelResponse:
+        content = self.invoke(messages)
+        self._assistant_message(messages, content)
+        return ModelResponse(content=content)
+
+    async def aresponse(self, messages: List[Message]) -> ModelResponse:
+        content = await self.ainvoke(messages)
+        self._assistant_message(messages, content)
+        return ModelResponse(content=content)
+
+    def response_stream(self, messages: List[Message]) -> Iterator[ModelResponse]:
+        content = ""
+        for chunk in self.invoke_stream(messages):
+            content += chunk
+            yield ModelResponse(content=chunk)
+        self._assistant_message(messages, content)
+
+    async def aresponse_stream(self, messages: List[Message]) -> Any:
+        content = ""
+        async for chunk in self.ainvoke_stream(messages):
+            content += chunk
+            yield ModelResponse(content=chunk)
+        self._assistant_message(messages, content)
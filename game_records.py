@@ -0,0 +1,232 @@
+import argparse
+import json
+import struct
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from connect4_board import ConnectFourBoard
+
+
+# Results a record can carry; the index is the result code in the binary format
+RESULT_CODES = ("", "WINNER - RED", "WINNER - YELLOW", "TIE", "TIMEOUT", "ERROR")
+
+# rows, cols, number of moves, start time, duration, result code
+_HEADER = struct.Struct("<BBHdfB")
+_LENGTH = struct.Struct("<I")
+
+
+@dataclass
+class GameRecord:
+    """One finished (or abandoned) Connect Four game.
+
+    Latency is the wall time from the previous move to this one, so it covers
+    the player's thinking time and, for LLM players, the model round trips.
+    Tokens are the prompt plus completion tokens spent on the move, 0 for
+    local players.
+    """
+
+    rows: int = 4
+    cols: int = 4
+    red: str = "llm"
+    yellow: str = "llm"
+    moves: List[int] = field(default_factory=list)
+    latencies: List[float] = field(default_factory=list)
+    tokens: List[int] = field(default_factory=list)
+    result: str = ""
+    started: float = field(default_factory=time.time)
+    duration: float = 0.0
+
+    def add_move(self, col: int, latency: float, tokens: int = 0) -> None:
+        self.moves.append(col)
+        self.latencies.append(latency)
+        self.tokens.append(tokens)
+
+    def boards(self) -> Iterator[ConnectFourBoard]:
+        """Replay the game lazily, yielding the board after every move.
+
+        The same board object is yielded each time; copy it (e.g. via encode())
+        to keep a position.
+        """
+        board = ConnectFourBoard(self.rows, self.cols)
+        for col in self.moves:
+            if not board.drop_piece(col):
+                raise ValueError(f"Illegal move {col} at ply {board.move_count + 1}")
+            yield board
+
+    def to_bytes(self) -> bytes:
+        """Binary form: a fixed header, the player names, then moves, latencies and tokens as packed arrays"""
+        if self.result not in RESULT_CODES:
+            raise ValueError(f"Unknown result: {self.result!r}")
+        n = len(self.moves)
+        names = b"".join(bytes([len(name)]) + name for name in (self.red.encode()[:255], self.yellow.encode()[:255]))
+        return b"".join(
+            (
+                _HEADER.pack(self.rows, self.cols, n, self.started, self.duration, RESULT_CODES.index(self.result)),
+                names,
+                bytes(self.moves),
+                struct.pack(f"<{n}f", *self.latencies),
+                struct.pack(f"<{n}I", *self.tokens),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GameRecord":
+        rows, cols, n, started, duration, code = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        names = []
+        for _ in range(2):
+            length = data[offset]
+            names.append(data[offset + 1:offset + 1 + length].decode())
+            offset += 1 + length
+        moves = list(data[offset:offset + n])
+        offset += n
+        latencies = list(struct.unpack_from(f"<{n}f", data, offset))
+        offset += 4 * n
+        tokens = list(struct.unpack_from(f"<{n}I", data, offset))
+        return cls(rows, cols, names[0], names[1], moves, latencies, tokens, RESULT_CODES[code], started, duration)
+
+
+def _is_binary(path: str) -> bool:
+    return path.endswith(".bin")
+
+
+class GameRecordWriter:
+    """Buffered, append-only writer for game records.
+
+    Paths ending in '.bin' get length-prefixed binary records, anything else
+    gets one JSON object per line. Records are held in memory and written in
+    batches of `buffer_size`; call flush() or close() (or use the writer as a
+    context manager) to write the rest.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 256):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.binary = _is_binary(path)
+        self._buffer: List[bytes] = []
+        self._file = open(path, "ab")
+
+    def write(self, record: GameRecord) -> None:
+        if self.binary:
+            data = record.to_bytes()
+            self._buffer.append(_LENGTH.pack(len(data)) + data)
+        else:
+            self._buffer.append(json.dumps(asdict(record), separators=(",", ":")).encode() + b"\n")
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_records(path: str) -> Iterator[GameRecord]:
+    """Stream records from a file one at a time, so archives never have to fit in memory"""
+    with open(path, "rb") as f:
+        if _is_binary(path):
+            while True:
+                prefix = f.read(_LENGTH.size)
+                if not prefix:
+                    return
+                if len(prefix) < _LENGTH.size:
+                    raise ValueError(f"Truncated record in {path}")
+                (length,) = _LENGTH.unpack(prefix)
+                data = f.read(length)
+                if len(data) < length:
+                    raise ValueError(f"Truncated record in {path}")
+                yield GameRecord.from_bytes(data)
+        else:
+            for line in f:
+                if line.strip():
+                    yield GameRecord(**json.loads(line))
+
+
+def game_stats(records: Iterable[GameRecord], opening_depth: int = 1) -> Dict:
+    """Aggregate results, game length, latency, tokens and per-opening win rates in a single pass"""
+    results: Dict[str, int] = defaultdict(int)
+    openings: Dict[str, Dict[str, float]] = defaultdict(lambda: {"games": 0, "red_wins": 0, "yellow_wins": 0, "ties": 0})
+    games = plies = tokens = 0
+    latency = 0.0
+
+    for record in records:
+        games += 1
+        plies += len(record.moves)
+        latency += sum(record.latencies)
+        tokens += sum(record.tokens)
+        results[record.result or "UNFINISHED"] += 1
+
+        if len(record.moves) >= opening_depth:
+            row = openings["-".join(map(str, record.moves[:opening_depth]))]
+            row["games"] += 1
+            if record.result == "WINNER - RED":
+                row["red_wins"] += 1
+            elif record.result == "WINNER - YELLOW":
+                row["yellow_wins"] += 1
+            elif record.result == "TIE":
+                row["ties"] += 1
+
+    for row in openings.values():
+        row["red_win_rate"] = row["red_wins"] / row["games"]
+    return {
+        "games": games,
+        "results": dict(results),
+        "average_length": plies / games if games else 0.0,
+        "average_move_latency": latency / plies if plies else 0.0,
+        "average_tokens_per_game": tokens / games if games else 0.0,
+        "openings": dict(sorted(openings.items(), key=lambda item: -item[1]["games"])),
+    }
+
+
+def _nth_record(path: str, index: int) -> Optional[GameRecord]:
+    for i, record in enumerate(read_records(path)):
+        if i == index:
+            return record
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay and analyse recorded Connect Four games")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats = commands.add_parser("stats", help="Aggregate statistics over a record file")
+    stats.add_argument("path")
+    stats.add_argument("--opening-depth", type=int, default=1, help="Number of opening plies to group games by")
+
+    replay = commands.add_parser("replay", help="Print every position of one recorded game")
+    replay.add_argument("path")
+    replay.add_argument("--game", type=int, default=0, help="Index of the game in the file")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(json.dumps(game_stats(read_records(args.path), args.opening_depth), indent=2))
+        return
+
+    record = _nth_record(args.path, args.game)
+    if record is None:
+        parser.error(f"{args.path} has no game {args.game}")
+    print(f"RED: {record.red}  YELLOW: {record.yellow}")
+    for ply, board in enumerate(record.boards()):
+        print(f"Ply {ply + 1}: {board.moves[-1]} ({record.latencies[ply]:.2f}s, {record.tokens[ply]} tokens)")
+        for row in board.get_board_state():
+            print(" ".join(row))
+        print()
+    print(record.result or "UNFINISHED")
+
+
+if __name__ == "__main__":
+    main()
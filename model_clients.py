@@ -0,0 +1,87 @@
+import os
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from agno.agent import Agent
+from agno.models.base import Model
+
+
+@lru_cache(maxsize=None)
+def shared_http_client():
+    """One pooled HTTP client per process for the default OpenAI models.
+
+    Without it agno builds a new OpenAI client, and with it a new connection
+    pool, for every call.
+    """
+    import httpx
+
+    return httpx.Client(limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+
+
+@lru_cache(maxsize=None)
+def _pooled_openai_chat() -> type:
+    """OpenAIChat whose sync client is built once, on first use, over the shared HTTP client.
+
+    Only the sync path is pooled here: an httpx.Client cannot serve AsyncOpenAI,
+    so async calls keep agno's own client, or the one a ProviderPool attaches.
+    """
+    from agno.models.openai import OpenAIChat
+    from openai import OpenAI
+
+    class PooledOpenAIChat(OpenAIChat):
+        def get_client(self) -> OpenAI:
+            if self.client is None:
+                self.client = OpenAI(**self._get_client_params(), http_client=shared_http_client())
+            return self.client
+
+    return PooledOpenAIChat
+
+
+def default_model(model_id: str = "gpt-4o") -> Model:
+    """The model the games use when no model_factory is given.
+
+    The OpenAI SDK is only imported here, on first use, so importing the game
+    modules, or running them with local players or a fake model, stays fast.
+    """
+    return _pooled_openai_chat()(id=model_id)
+
+
+class GameModels:
+    """Builds the models for a game's agents and hooks up its cache and tracer.
+
+    `model_factory` makes each model, e.g. a FakeModel for offline runs, and
+    defaults to `default_model`. With an opt-in CompletionCache the player
+    models run at temperature 0 and are cached, so they play deterministically.
+    With an opt-in Tracer every agent's model calls are timed.
+    """
+
+    def __init__(self, model_factory: Optional[Callable[[], Model]] = None, cache=None, tracer=None):
+        self.model_factory = model_factory
+        self.cache = cache
+        self.tracer = tracer
+
+    def new_model(self) -> Model:
+        return self.model_factory() if self.model_factory is not None else default_model()
+
+    def player_model(self) -> Model:
+        """Model for a player agent, made deterministic and cached when there is a cache"""
+        model = self.new_model()
+        if self.cache is not None:
+            if hasattr(model, "temperature"):
+                model.temperature = 0
+            self.cache.wrap(model)
+        return model
+
+    @staticmethod
+    def telemetry(model: Model) -> bool:
+        """The telemetry flag for an agent on `model`.
+
+        agno only honours AGNO_TELEMETRY=false when the agent also passes
+        telemetry=False. Models can opt out with a `telemetry` attribute.
+        """
+        return getattr(model, "telemetry", True) and os.getenv("AGNO_TELEMETRY", "true").lower() == "true"
+
+    def trace(self, agents: Dict[str, Agent]) -> None:
+        if self.tracer is not None:
+            for agent in agents.values():
+                self.tracer.wrap(agent.model, agent.name)
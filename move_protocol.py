@@ -0,0 +1,98 @@
+import inspect
+from functools import lru_cache
+from typing import Any, Callable, Generator, Literal, Optional, Tuple, Type, TypeVar
+
+from agno.utils.log import logger
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+
+class ColumnMove(BaseModel):
+    """A Connect Four player's chosen column"""
+
+    column: int = Field(..., description="Column to drop the piece into")
+    reason: Optional[str] = Field(None, description="One short sentence explaining the choice")
+
+
+@lru_cache(maxsize=None)
+def legal_move_model(legal: Tuple[int, ...]) -> Type[ColumnMove]:
+    """ColumnMove whose schema only allows the given columns"""
+    return create_model(
+        "ColumnMove",
+        __base__=ColumnMove,
+        column=(Literal[legal], Field(..., description=f"Column to drop the piece into, one of {list(legal)}")),
+    )
+
+
+class RPSChoice(BaseModel):
+    """A Rock-Paper-Scissors player's choice"""
+
+    choice: Literal["Rock", "Paper", "Scissors"]
+    reason: Optional[str] = Field(None, description="One short sentence explaining the choice")
+
+
+Reply = TypeVar("Reply", bound=BaseModel)
+
+
+def validate_reply(content, model: Type[Reply]) -> Tuple[Optional[Reply], str]:
+    """Validate an agent reply against a response model, returning (value, error message)"""
+    if isinstance(content, model):
+        return content, ""
+    if isinstance(content, BaseModel):
+        content = content.model_dump_json()
+    try:
+        return model.model_validate_json(str(content).strip().removeprefix("```json").removesuffix("```")), ""
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"] for err in e.errors()
+        )
+
+
+def _attempts(reply_model: Type[Reply], name: str, attempts: int) -> Generator[Tuple[str, int], Any, Reply]:
+    """The retry loop: yields (previous error, attempt) and is sent back each response"""
+    error = ""
+    for attempt in range(1, attempts + 1):
+        response = yield error, attempt
+        reply, error = validate_reply(response.content, reply_model)
+        if reply is not None:
+            return reply
+        logger.warning(f"{name} replied with an invalid {reply_model.__name__}: {error}")
+    raise ValueError(f"{name} failed to give a valid {reply_model.__name__} after {attempts} attempts")
+
+
+def ask_with_retries(
+    request: Callable[[str, int], Any],
+    reply_model: Type[Reply],
+    name: str,
+    attempts: int = 2,
+    on_response: Optional[Callable[[Any], None]] = None,
+):
+    """Ask an agent until its reply validates against `reply_model`, at most `attempts` times.
+
+    `request(error, attempt)` sends one prompt, mentioning the previous
+    validation error if there was one, and returns the agent's response, which
+    is passed to `on_response`. If `request` returns an awaitable, e.g. from
+    agent.arun, this returns a coroutine to await instead, so sync and async
+    games share one retry loop. Raises ValueError once every attempt failed.
+    """
+    steps = _attempts(reply_model, name, attempts)
+    response = request(*next(steps))
+    if inspect.isawaitable(response):
+        return _ask_async(steps, request, response, on_response)
+    while True:
+        if on_response is not None:
+            on_response(response)
+        try:
+            response = request(*steps.send(response))
+        except StopIteration as done:
+            return done.value
+
+
+async def _ask_async(steps, request, response, on_response):
+    while True:
+        response = await response
+        if on_response is not None:
+            on_response(response)
+        try:
+            response = request(*steps.send(response))
+        except StopIteration as done:
+            return done.value
@@ -1,37 +1,38 @@
 import streamlit as st
 from rock_paper_scissor_main import RockPaperScissorsGame
 
-# Initialize the game
-game = RockPaperScissorsGame()
+# Agents are built once per session, not on every rerun
+if "game" not in st.session_state:
+    st.session_state.game = RockPaperScissorsGame()
+game = st.session_state.game
 
 st.title("🤖 Rock-Paper-Scissors AI Game")
 
-# Placeholder for game results
-result_placeholder = st.empty()
+rounds = st.number_input("Rounds", min_value=1, max_value=100, value=5)
 
 # Start the game button
 if st.button("Start Game"):
-    with st.spinner("Playing 5 rounds..."):
-        
-        response = game.agents["master"].run(
-                "New Rock-Paper-Scissors game started. Play 5 rounds. RED and YELLOW will alternate their moves. The player with the most wins will be declared the winner.",
-                stream=True,
+    # The score is redrawn in place and each round is appended below it, so nothing is re-rendered
+    score_placeholder = st.empty()
+    rounds_log = st.container()
+
+    def show_round(round_number: int, red: str, yellow: str, result: str) -> None:
+        score = game.score
+        score_placeholder.markdown(
+            f"### 🔴 RED {score.red_wins} – {score.yellow_wins} YELLOW 🟡\n"
+            f"Draws: {score.draws} · Round {round_number} of {rounds}"
         )
+        rounds_log.markdown(f"**Round {round_number}:** 🔴 {red} vs 🟡 {yellow} → {result}")
 
-        full_output = ""  # To accumulate the streamed response
-
-        # Stream the output to the UI
-        for chunk in response:
-            full_output += chunk.content
-            result_placeholder.markdown(full_output)  # Dynamically update the UI
-
-        # Final output
-        st.success("🎯 Game Over!")
-        st.text_area("📜 Full Game Log", full_output, height=400)
-
-        # Display the full game output
-        result_placeholder.text(full_output)
+    game.reset()
+    with st.spinner(f"Playing {rounds} rounds..."):
+        try:
+            result = game.play(rounds, on_round=show_round)
+            # Final output
+            st.success(f"🎯 Game Over! {result}")
+        except Exception as e:
+            st.error(f"Error playing game: {str(e)}")
 
 # Option to restart the game
 if st.button("Restart Game"):
-    st.experimental_rerun()
+    st.rerun()
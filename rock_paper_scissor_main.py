@@ -1,21 +1,89 @@
-from typing import Dict
-import sys
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import argparse
+import uuid
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.utils.log import logger
+from model_clients import GameModels
+from move_protocol import RPSChoice, ask_with_retries
+from rock_paper_scissor_players import (
+    EnsemblePlayer,
+    FrequencyPlayer,
+    MarkovPlayer,
+    RandomPlayer,
+    determine_winner,
+)
+from tracing import Tracer, print_report
+
+
+class MatchScore:
+    """Running score of a match: win and draw counters plus the choices of the last `history` rounds"""
+
+    __slots__ = ("red_wins", "yellow_wins", "draws", "recent")
+
+    def __init__(self, history: int = 5):
+        self.red_wins = 0
+        self.yellow_wins = 0
+        self.draws = 0
+        self.recent: Deque[Tuple[str, str]] = deque(maxlen=history)
+
+    @property
+    def rounds(self) -> int:
+        return self.red_wins + self.yellow_wins + self.draws
+
+    def record(self, red: str, yellow: str) -> str:
+        """Score one round and return its result"""
+        result = determine_winner(red, yellow)
+        if result == "DRAW":
+            self.draws += 1
+        elif result == "WINNER - RED":
+            self.red_wins += 1
+        else:
+            self.yellow_wins += 1
+        self.recent.append((red, yellow))
+        return result
+
+    def result(self) -> str:
+        if self.red_wins == self.yellow_wins:
+            return "DRAW"
+        return "WINNER - RED" if self.red_wins > self.yellow_wins else "WINNER - YELLOW"
 
 
 class RockPaperScissorsGame:
-    def __init__(self):
+    def __init__(
+        self, red_player=None, yellow_player=None, model_factory=None, cache=None, tracer=None, history: int = 5
+    ):
+        # Local players expose choose() and observe(own, opponent); None means the LLM agent plays that colour
+        self.players = {"RED": red_player, "YELLOW": yellow_player}
+        # Model factory, opt-in CompletionCache and opt-in Tracer for the agents
+        self.models = GameModels(model_factory, cache, tracer)
+        self.tracer = tracer
+        self.game_id = uuid.uuid4().hex[:12]
+        self.round_number = 0
+        self.rounds = 0
+        # Number of past rounds shown to the LLM players
+        self.history = history
+        self.score = MatchScore(history)
         try:
             self.agents = self._initialize_agents()
         except Exception as e:
             logger.error(f"Failed to initialize agents: {str(e)}")
             raise
 
+    def reset(self) -> None:
+        """Start a new match with the same agents; local players keep what they learned about the opponent"""
+        self._new_match(0)
+        self.game_id = uuid.uuid4().hex[:12]
+        for agent in self.agents.values():
+            if agent.memory is not None:
+                agent.memory.clear()
+
     def _initialize_agents(self) -> Dict[str, Agent]:
         """Initialize all required agents for Rock-Paper-Scissors with specific roles"""
         try:
+            red_model = self.models.player_model()
+            yellow_model = self.models.player_model()
+
             player_red_agent = Agent(
                 name="player_red_agent",
                 role="""
@@ -23,9 +91,12 @@ class RockPaperScissorsGame:
                     Your task is to select one of the three options: 'Rock', 'Paper', or 'Scissors'.
                     Consider simple strategies but make random choices to keep the game unpredictable.
                     Do not select the same option everytime.
+                    You are shown the score and the last few rounds.
                     Respond ONLY with your choice.
                 """,
-                model=OpenAIChat(id="gpt-4o"),
+                model=red_model,
+                response_model=RPSChoice,
+                telemetry=self.models.telemetry(red_model),
             )
 
             player_yellow_agent = Agent(
@@ -33,89 +104,146 @@ class RockPaperScissorsGame:
                 role="""
                     You are a Rock-Paper-Scissors player playing as YELLOW. 
                     Your task is to select one of the three options: 'Rock', 'Paper', or 'Scissors'.
-                    You are slightly more strategic and may try to counter the RED player's previous choices.
+                    You are slightly more strategic and may try to counter the RED player's previous choices,
+                    which are shown to you with the score.
                     Respond ONLY with your choice.
                     Do not select the same choice everytime. 
                 """,
-                model=OpenAIChat(id="gpt-4o"),
-            )
-
-            result_checker = Agent(
-                name="result_checker",
-                role="""
-                    You are responsible for determining the winner in a Rock-Paper-Scissors game.
-                    Given the choices of both players (RED and YELLOW), determine the winner based on the rules:
-                    - Rock beats Scissors
-                    - Scissors beats Paper
-                    - Paper beats Rock
-                    If both players choose the same, it's a draw.
-
-                    Respond with 'WINNER - RED', 'WINNER - YELLOW', or 'DRAW' based on the outcome.
-                """,
-                model=OpenAIChat(id="gpt-4o"),
-            )
-
-            master_agent = Agent(
-                name="master_agent",
-                role="""
-                    You are the master agent overseeing the Rock-Paper-Scissors game. 
-                    Your job is to coordinate the gameplay using the following agents:
-                    - **player_red_agent**: Chooses move for the RED player.
-                    - **player_yellow_agent**: Chooses move for the YELLOW player.
-                    - **result_checker**: Determines the winner based on both players' choices.
-
-                    **Responsibilities:**
-                    1. Start the game and clearly announce when each round begins.
-                    2. Request choices from both RED and YELLOW agents.
-                    3. Send both choices to the **result_checker** to determine the winner.
-                    4. Display the choices of both players and the result after each round.
-                    5. Continue for 5 rounds and declare the final winner based on who won the most rounds.
-
-                    Respond with commentary after each round and provide the final score at the end.
-                """,
-                 instructions=[
-                    "1. Ensure that all 5 rounds are played and do not stop before the 5 rounds.",
-                ],
-                model=OpenAIChat(id="gpt-4o"),
-                markdown=True,
-                team=[player_red_agent, player_yellow_agent, result_checker],
-                show_tool_calls=True,
+                model=yellow_model,
+                response_model=RPSChoice,
+                telemetry=self.models.telemetry(yellow_model),
             )
 
-            return {
+            agents = {
                 "red": player_red_agent,
                 "yellow": player_yellow_agent,
-                "checker": result_checker,
-                "master": master_agent,
             }
+            self.models.trace(agents)
+            return agents
         except Exception as e:
             logger.error(f"Error initializing agents: {str(e)}")
             raise
 
-    def start_game(self):
-        """Start and manage the Rock-Paper-Scissors game"""
-        try:
-            response = self.agents["master"].run(
-                "New Rock-Paper-Scissors game started. Play 5 rounds. RED and YELLOW will alternate their moves. The player with the most wins will be declared the winner.",
-                stream=True,
+    def _choice_prompt(self, color: str, error: str = "") -> str:
+        """Round number, score and the last rounds from the player's side, so the prompt stays the same size"""
+        score = self.score
+        own, other = ("RED", "YELLOW") if color == "RED" else ("YELLOW", "RED")
+        prompt = (
+            f"Round {self.round_number} of {self.rounds}. "
+            f"Score: {own} (you) {score.red_wins if own == 'RED' else score.yellow_wins}, "
+            f"{other} {score.yellow_wins if own == 'RED' else score.red_wins}, draws {score.draws}."
+        )
+        if score.recent:
+            rounds = ", ".join(
+                f"you {red} vs {yellow}" if own == "RED" else f"you {yellow} vs {red}" for red, yellow in score.recent
+            )
+            prompt += f"\nLast rounds, oldest first: {rounds}."
+        prompt += "\nChoose your move for this round."
+        if error:
+            prompt += f" Your previous reply was rejected ({error})."
+        return prompt
+
+    def _annotate(self, attempt: int = 1) -> None:
+        """Tag the agent calls that follow with this game, round and attempt when tracing"""
+        if self.tracer is not None:
+            self.tracer.annotate(game="rps", game_id=self.game_id, move=self.round_number, attempt=attempt)
+
+    def _ask_agent(self, color: str, attempts: int = 2, run: Optional[Callable[[Agent, str], Any]] = None):
+        """Ask the LLM player agent for an RPSChoice, validated locally against its schema.
+
+        `run(agent, prompt)` sends the prompt, by default with agent.run; an
+        async `run` makes this return a coroutine, as in AsyncRockPaperScissorsGame.
+        """
+        agent = self.agents[color.lower()]
+        run = run or (lambda agent, prompt: agent.run(prompt))
+
+        def request(error: str, attempt: int):
+            self._annotate(attempt)
+            return run(agent, self._choice_prompt(color, error))
+
+        return ask_with_retries(request, RPSChoice, agent.name, attempts)
+
+    def _new_match(self, rounds: int) -> None:
+        self.rounds = rounds
+        self.round_number = 0
+        self.score = MatchScore(self.history)
+
+    def _finish_round(self, red: str, yellow: str) -> str:
+        """Let local players observe the round, score it and return its result"""
+        if self.players["RED"] is not None:
+            self.players["RED"].observe(red, yellow)
+        if self.players["YELLOW"] is not None:
+            self.players["YELLOW"].observe(yellow, red)
+        return self.score.record(red, yellow)
+
+    def play(self, rounds: int = 5, on_round: Optional[Callable[[int, str, str, str], None]] = None) -> str:
+        """Play a match driven from Python, asking local players or LLM agents for each choice"""
+        self._new_match(rounds)
+        for round_number in range(1, rounds + 1):
+            self.round_number = round_number
+            choices = {}
+            for color, player in self.players.items():
+                choices[color] = player.choose() if player is not None else self._ask_agent(color).choice
+            result = self._finish_round(choices["RED"], choices["YELLOW"])
+            if on_round is not None:
+                on_round(round_number, choices["RED"], choices["YELLOW"], result)
+        return self.score.result()
+
+    def start_game(self, rounds: int = 5) -> str:
+        """Play a match of `rounds` rounds, printing every round and the final result"""
+        def print_round(round_number: int, red: str, yellow: str, result: str) -> None:
+            score = self.score
+            print(
+                f"Round {round_number}: RED {red} vs YELLOW {yellow} -> {result} "
+                f"(RED {score.red_wins}, YELLOW {score.yellow_wins}, draws {score.draws})"
             )
 
-            for chunk in response:
-                sys.stdout.write(chunk)
-                sys.stdout.flush()
-
-            return response
+        try:
+            result = self.play(rounds, on_round=print_round)
+            print(result)
+            return result
         except Exception as e:
             print(f"Error starting game: {str(e)}")
             raise
 
 
+PLAYER_CHOICES = ("llm", "random", "frequency", "markov", "ensemble")
+
+
+def create_player(kind: str, seed: Optional[int] = None):
+    """Build a player by name; 'llm' returns None so the colour is played by its agent"""
+    if kind == "llm":
+        return None
+    if kind == "random":
+        return RandomPlayer(seed=seed)
+    if kind == "frequency":
+        return FrequencyPlayer(seed=seed)
+    if kind == "markov":
+        return MarkovPlayer(order=2, seed=seed)
+    if kind == "ensemble":
+        return EnsemblePlayer(seed=seed)
+    raise ValueError(f"Unknown player type: {kind}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Play a game of Rock-Paper-Scissors")
+    parser.add_argument("--red", choices=PLAYER_CHOICES, default="llm", help="Player for RED")
+    parser.add_argument("--yellow", choices=PLAYER_CHOICES, default="llm", help="Player for YELLOW")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds in the match")
+    parser.add_argument("--trace", help="Write agent call traces to this file (.jsonl, or .prom for OpenMetrics)")
+    args = parser.parse_args()
+    tracer = Tracer(args.trace) if args.trace else None
     try:
-        game = RockPaperScissorsGame()
-        game.start_game()
+        game = RockPaperScissorsGame(
+            red_player=create_player(args.red), yellow_player=create_player(args.yellow), tracer=tracer
+        )
+        game.start_game(args.rounds)
     except Exception as e:
         print(f"Fatal error: {str(e)}")
+    finally:
+        if tracer is not None:
+            tracer.close()
+            print_report(tracer.summary())
 
 
 if __name__ == "__main__":
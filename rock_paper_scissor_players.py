@@ -0,0 +1,149 @@
+import random
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+
+CHOICES = ("Rock", "Paper", "Scissors")
+# Each choice mapped to the choice it beats
+BEATS = {"Rock": "Scissors", "Scissors": "Paper", "Paper": "Rock"}
+INDEX = {choice: i for i, choice in enumerate(CHOICES)}
+# Round result for every (RED, YELLOW) pair of choices
+RESULTS = {
+    (red, yellow): "DRAW" if red == yellow else "WINNER - RED" if BEATS[red] == yellow else "WINNER - YELLOW"
+    for red in CHOICES
+    for yellow in CHOICES
+}
+
+
+def determine_winner(red: str, yellow: str) -> str:
+    """Returns 'WINNER - RED', 'WINNER - YELLOW', or 'DRAW' for one round"""
+    return RESULTS[red, yellow]
+
+
+def counter(index: int) -> int:
+    """Index of the choice that beats the choice at `index`; in CHOICES order each beats the one before"""
+    return (index + 1) % 3
+
+
+class RandomPlayer:
+    """Plays uniformly at random from a seeded generator"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def choose(self) -> str:
+        return self.rng.choice(CHOICES)
+
+    def observe(self, own: str, opponent: str) -> None:
+        """Called after every round with both choices; random play ignores it"""
+
+
+class PredictorPlayer(ABC):
+    """Base for players that predict the opponent's next choice and play its counter.
+
+    Subclasses implement `predict` (an index into CHOICES, or None without
+    enough data, in which case the player picks at random) and `update`, both
+    in constant time so matches can run for millions of rounds.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    @abstractmethod
+    def predict(self) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    def update(self, own: int, opponent: int) -> None:
+        ...
+
+    def choose(self) -> str:
+        prediction = self.predict()
+        if prediction is None:
+            return self.rng.choice(CHOICES)
+        return CHOICES[counter(prediction)]
+
+    def observe(self, own: str, opponent: str) -> None:
+        self.update(INDEX[own], INDEX[opponent])
+
+
+class FrequencyPlayer(PredictorPlayer):
+    """Counters the opponent's most frequent choice so far"""
+
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(seed)
+        self.counts = [0, 0, 0]
+        # Most frequent choice, kept up to date on every update
+        self.best: Optional[int] = None
+
+    def predict(self) -> Optional[int]:
+        return self.best
+
+    def update(self, own: int, opponent: int) -> None:
+        self.counts[opponent] += 1
+        if self.best is None or self.counts[opponent] > self.counts[self.best]:
+            self.best = opponent
+
+
+class MarkovPlayer(PredictorPlayer):
+    """Order-k Markov (n-gram) predictor over the opponent's last `order` choices.
+
+    The context is kept as a base-3 integer, so each update is one table
+    increment and one shift, and the table has 3**order rows.
+    """
+
+    def __init__(self, order: int = 1, seed: Optional[int] = None):
+        super().__init__(seed)
+        if order < 1:
+            raise ValueError(f"Markov order must be at least 1, got {order}")
+        self.order = order
+        self._size = 3 ** order
+        self.table = [[0, 0, 0] for _ in range(self._size)]
+        # Most frequent follow-up per context, or -1 before the context has been seen
+        self.best = [-1] * self._size
+        self.context = 0
+        self.seen = 0
+
+    def predict(self) -> Optional[int]:
+        if self.seen < self.order or self.best[self.context] < 0:
+            return None
+        return self.best[self.context]
+
+    def update(self, own: int, opponent: int) -> None:
+        if self.seen >= self.order:
+            counts, best = self.table[self.context], self.best[self.context]
+            counts[opponent] += 1
+            if best < 0 or counts[opponent] > counts[best]:
+                self.best[self.context] = opponent
+        self.context = (self.context * 3 + opponent) % self._size
+        self.seen += 1
+
+
+class EnsemblePlayer(PredictorPlayer):
+    """Follows whichever member predictor has scored best recently.
+
+    After every round each member scores +1 for a correct prediction and -1
+    for a wrong one, with older rounds weighted down by `decay`, so the
+    ensemble switches quickly when the opponent changes strategy.
+    """
+
+    def __init__(
+        self, members: Optional[Sequence[PredictorPlayer]] = None, decay: float = 0.9, seed: Optional[int] = None
+    ):
+        super().__init__(seed)
+        self.members: List[PredictorPlayer] = list(
+            members if members is not None else (FrequencyPlayer(), MarkovPlayer(1), MarkovPlayer(2), MarkovPlayer(3))
+        )
+        self.decay = decay
+        self.scores = [0.0] * len(self.members)
+
+    def predict(self) -> Optional[int]:
+        best = max(range(len(self.members)), key=self.scores.__getitem__)
+        return self.members[best].predict()
+
+    def update(self, own: int, opponent: int) -> None:
+        for i, member in enumerate(self.members):
+            prediction = member.predict()
+            hit = 0 if prediction is None else 1 if prediction == opponent else -1
+            self.scores[i] = self.decay * self.scores[i] + hit
+            member.update(own, opponent)
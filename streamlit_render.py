@@ -0,0 +1,76 @@
+import time
+from typing import Optional
+
+import streamlit as st
+
+from connect4_board import ConnectFourBoard
+
+
+PIECE_COLORS = {"R": "#e53935", "Y": "#fdd835", ".": "#ffffff"}
+
+
+class ThrottledRenderer:
+    """Streams text into a Streamlit container without re-rendering what is already shown.
+
+    Chunks are buffered and drawn at most every `interval` seconds, or sooner
+    once `max_chars` are pending. Finished paragraphs are appended to the
+    container as their own markdown elements and never touched again; only
+    the paragraph still being written is redrawn in place, so each update
+    costs the size of one paragraph rather than the whole transcript.
+    """
+
+    def __init__(self, container=None, interval: float = 0.25, max_chars: int = 2000):
+        self.container = container if container is not None else st.container()
+        self.interval = interval
+        self.max_chars = max_chars
+        self.text = ""
+        self._tail = ""
+        self._pending = 0
+        self._last_render = 0.0
+        self._tail_placeholder = None
+
+    def write(self, chunk: Optional[str]) -> None:
+        if not chunk:
+            return
+        self.text += chunk
+        self._tail += chunk
+        self._pending += len(chunk)
+        if self._pending >= self.max_chars or time.perf_counter() - self._last_render >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Draw everything received so far"""
+        done, sep, tail = self._tail.rpartition("\n\n")
+        if sep:
+            # Freeze the finished paragraphs above the one still being streamed
+            if self._tail_placeholder is not None:
+                self._tail_placeholder.markdown(done)
+                self._tail_placeholder = None
+            else:
+                self.container.markdown(done)
+            self._tail = tail
+        if self._tail:
+            if self._tail_placeholder is None:
+                self._tail_placeholder = self.container.empty()
+            self._tail_placeholder.markdown(self._tail)
+        self._pending = 0
+        self._last_render = time.perf_counter()
+
+
+def board_html(board: ConnectFourBoard, cell_size: int = 44) -> str:
+    """The board as a CSS grid of discs, top row first"""
+    discs = "".join(
+        f'<div style="width:{cell_size - 8}px;height:{cell_size - 8}px;border-radius:50%;'
+        f'background:{PIECE_COLORS[cell]};margin:4px"></div>'
+        for row in board.get_board_state()
+        for cell in row
+    )
+    return (
+        f'<div style="display:inline-grid;grid-template-columns:repeat({board.cols},{cell_size}px);'
+        f'background:#1e4fd6;padding:6px;border-radius:10px">{discs}</div>'
+    )
+
+
+def show_board(placeholder, board: ConnectFourBoard) -> None:
+    """Draw the board into a placeholder made with st.empty(), replacing what it showed before"""
+    placeholder.markdown(board_html(board), unsafe_allow_html=True)
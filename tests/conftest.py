@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The game modules live at the top level of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests run offline; agno would otherwise report every agent run over the network
+os.environ.setdefault("AGNO_TELEMETRY", "false")
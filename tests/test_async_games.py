@@ -0,0 +1,65 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import List
+
+from agno.models.message import Message
+
+from async_games import AsyncConnect4Game, AsyncRockPaperScissorsGame, ProviderPool, play_many
+from fake_model import FakeModel
+
+
+class InFlight:
+    """Counts concurrent model calls"""
+
+    def __init__(self):
+        self.now = 0
+        self.peak = 0
+
+
+@dataclass
+class CountingModel(FakeModel):
+    """FakeModel that reports how many of its calls are running at once"""
+
+    in_flight: InFlight = None
+
+    async def ainvoke(self, messages: List[Message]) -> str:
+        self.in_flight.now += 1
+        self.in_flight.peak = max(self.in_flight.peak, self.in_flight.now)
+        try:
+            return await super().ainvoke(messages)
+        finally:
+            self.in_flight.now -= 1
+
+
+def first_legal(prompt: str) -> str:
+    legal = json.loads(prompt.split("Legal moves: ")[1].split("\n")[0])
+    return json.dumps({"column": legal[0], "reason": "First legal column"})
+
+
+def test_games_run_offline_within_the_provider_limit():
+    in_flight = InFlight()
+    pool = ProviderPool(limits={"Fake": 3})
+
+    def connect4_model():
+        return CountingModel(responder=first_legal, latency=0.01, in_flight=in_flight)
+
+    def rps_model():
+        return CountingModel(responses=['{"choice": "Rock"}', '{"choice": "Paper"}'], latency=0.01, in_flight=in_flight)
+
+    games = [AsyncConnect4Game(model_factory=connect4_model, pool=pool) for _ in range(6)]
+    matches = [AsyncRockPaperScissorsGame(model_factory=rps_model, pool=pool) for _ in range(6)]
+    results = asyncio.run(play_many([g.play_async() for g in games] + [m.play_async(rounds=3) for m in matches]))
+
+    assert results[:6] == ["WINNER - RED"] * 6
+    assert all(result in ("WINNER - RED", "WINNER - YELLOW", "DRAW") for result in results[6:])
+    assert all(game.board.check_winner() == "R" for game in games)
+    assert all(match.score.rounds == 3 for match in matches)
+    assert in_flight.peak == 3
+
+
+def test_games_reuse_the_pool_across_event_loops():
+    pool = ProviderPool(limits={"Fake": 1})
+    for _ in range(2):
+        games = [AsyncConnect4Game(model_factory=lambda: FakeModel(responder=first_legal), pool=pool) for _ in range(3)]
+        assert asyncio.run(play_many([g.play_async() for g in games])) == ["WINNER - RED"] * 3
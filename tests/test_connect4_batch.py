@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+
+from connect4_batch import RED, YELLOW, BatchConnectFourBoard
+from connect4_board import PIECES, ConnectFourBoard
+
+
+def test_lockstep_moves_match_scalar_boards():
+    rng = random.Random(0)
+    for rows, cols in ((4, 4), (6, 7)):
+        boards = [ConnectFourBoard(rows, cols) for _ in range(200)]
+        batch = BatchConnectFourBoard(len(boards), rows, cols)
+        while not batch.done.all():
+            cols_played = np.full(len(boards), -1)
+            for i, board in enumerate(boards):
+                if not (board.check_winner() or board.is_full()):
+                    cols_played[i] = rng.choice(board.legal_moves())
+                    board.drop_piece(int(cols_played[i]))
+            moved = batch.drop_piece(cols_played)
+            assert moved.tolist() == (cols_played >= 0).tolist()
+            for i, board in enumerate(boards):
+                assert batch.board(i).encode() == board.encode()
+                assert batch.winner[i] == {"": 0, "R": RED, "Y": YELLOW}[board.check_winner()]
+                assert batch.done[i] == bool(board.check_winner() or board.is_full())
+                assert batch.turn[i] == (RED if board.current_piece == PIECES[0] else YELLOW)
+                legal = [col for col in range(cols) if batch.legal_mask()[i, col]]
+                assert legal == ([] if board.check_winner() else board.legal_moves())
+
+
+def test_illegal_and_finished_boards_are_left_unchanged():
+    batch = BatchConnectFourBoard(3, 4, 4)
+    for _ in range(4):
+        batch.drop_piece(np.array([0, 1, 2]))
+    before = batch.cells.copy()
+    moved = batch.drop_piece(np.array([0, 4, -1]))
+    assert not moved.any()
+    assert (batch.cells == before).all()
+
+
+def test_winning_moves_match_scalar_boards():
+    rng = random.Random(1)
+    boards = []
+    while len(boards) < 300:
+        board = ConnectFourBoard(6, 7)
+        for _ in range(rng.randrange(4, 30)):
+            if board.check_winner() or board.is_full():
+                break
+            board.drop_piece(rng.choice(board.legal_moves()))
+        if not board.check_winner():
+            boards.append(board)
+    wins = BatchConnectFourBoard.from_boards(boards).winning_moves()
+    for i, board in enumerate(boards):
+        expected = []
+        for col in board.legal_moves():
+            board.drop_piece(col)
+            if board.check_winner():
+                expected.append(col)
+            board.undo_move()
+        assert np.flatnonzero(wins[i]).tolist() == expected
+
+
+def test_playout_finishes_every_board_from_a_shared_position():
+    board = ConnectFourBoard(6, 7)
+    for col in (3, 3, 2, 4):
+        board.drop_piece(col)
+    batch = BatchConnectFourBoard.repeat(board, 500)
+    batch.playout(np.random.default_rng(0))
+    results = batch.results()
+    assert results["UNFINISHED"] == 0
+    assert sum(results.values()) == 500
+    for i in range(0, 500, 50):
+        replay = batch.board(i)
+        assert replay.check_winner() == {0: "", RED: "R", YELLOW: "Y"}[int(batch.winner[i])]
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from connect4_board import CONNECT, EMPTY, ConnectFourBoard
+
+
+def naive_winner(board: ConnectFourBoard) -> str:
+    """Scan every cell and direction of the list-of-lists view for CONNECT in a row"""
+    state = board.get_board_state()
+    for r in range(board.rows):
+        for c in range(board.cols):
+            piece = state[r][c]
+            if piece == EMPTY:
+                continue
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + dr * (CONNECT - 1), c + dc * (CONNECT - 1)
+                if 0 <= end_r < board.rows and 0 <= end_c < board.cols and all(
+                    state[r + dr * i][c + dc * i] == piece for i in range(CONNECT)
+                ):
+                    return piece
+    return ""
+
+
+@pytest.mark.parametrize("rows,cols", [(4, 4), (6, 7), (5, 6)])
+def test_win_detection_matches_naive_scan(rows, cols):
+    rng = random.Random(rows * 100 + cols)
+    for _ in range(1000):
+        board = ConnectFourBoard(rows, cols)
+        while True:
+            assert board.check_winner() == naive_winner(board)
+            assert board.is_full() == (not board.legal_moves())
+            if board.check_winner() or board.is_full():
+                break
+            assert board.drop_piece(rng.choice(board.legal_moves()))
+
+
+def test_undo_restores_the_position():
+    rng = random.Random(0)
+    for _ in range(200):
+        board = ConnectFourBoard(6, 7)
+        snapshots = []
+        while not board.check_winner() and not board.is_full():
+            snapshots.append((board.encode(), board.check_winner(), board.current_piece))
+            board.drop_piece(rng.choice(board.legal_moves()))
+        for snapshot in reversed(snapshots):
+            board.undo_move()
+            assert (board.encode(), board.check_winner(), board.current_piece) == snapshot
+
+
+def test_rejects_moves_into_full_or_missing_columns():
+    board = ConnectFourBoard(4, 4)
+    for _ in range(4):
+        assert board.drop_piece(0)
+    before = board.encode()
+    assert not board.drop_piece(0)
+    assert not board.drop_piece(-1)
+    assert not board.drop_piece(4)
+    assert board.encode() == before
+
+
+def test_encodings_round_trip():
+    rng = random.Random(2)
+    for rows, cols in ((4, 4), (6, 7)):
+        for _ in range(200):
+            board = ConnectFourBoard(rows, cols)
+            for _ in range(rng.randrange(rows * cols + 1)):
+                if board.check_winner() or board.is_full():
+                    break
+                board.drop_piece(rng.choice(board.legal_moves()))
+            decoded = ConnectFourBoard.decode(board.encode())
+            assert decoded.get_board_state() == board.get_board_state()
+            assert decoded.check_winner() == board.check_winner()
+            assert decoded.current_piece == board.current_piece
+            rebuilt = ConnectFourBoard.from_base3(board.to_base3(), rows, cols)
+            assert rebuilt.encode() == board.encode()
+
+
+@pytest.mark.parametrize("encoded", ["..../R.../..../....", "..../..../..../RYX.", "..../..../RY"])
+def test_decode_rejects_invalid_boards(encoded):
+    with pytest.raises(ValueError):
+        ConnectFourBoard.decode(encoded)
+
+
+@pytest.mark.parametrize("value", [-1, 3 ** 16])
+def test_from_base3_rejects_out_of_range_values(value):
+    with pytest.raises(ValueError):
+        ConnectFourBoard.from_base3(value, 4, 4)
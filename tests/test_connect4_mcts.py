@@ -0,0 +1,46 @@
+import pytest
+
+from connect4_board import ConnectFourBoard
+from connect4_main import create_player
+from connect4_mcts import MCTSPlayer
+
+
+def position(*moves: int) -> ConnectFourBoard:
+    board = ConnectFourBoard(6, 7)
+    for col in moves:
+        board.drop_piece(col)
+    return board
+
+
+@pytest.mark.parametrize("rollout_batch", [1, 8])
+def test_takes_an_immediate_win(rollout_batch):
+    board = position(0, 0, 1, 1, 2, 2)
+    player = MCTSPlayer(playouts=3000, time_limit=0, rollout_batch=rollout_batch, seed=0)
+    assert player.choose_move(board) == 3
+
+
+def test_blocks_an_immediate_win():
+    board = position(0, 6, 1, 6, 2)
+    assert MCTSPlayer(playouts=3000, time_limit=0, seed=0).choose_move(board) == 3
+
+
+def test_search_leaves_the_board_unchanged_and_reuses_the_tree():
+    board = position(3, 3)
+    before = board.encode()
+    player = MCTSPlayer(playouts=500, time_limit=0, seed=0)
+    move = player.choose_move(board)
+    assert board.encode() == before
+    visits = player._root.visits
+
+    board.drop_piece(move)
+    board.drop_piece(0)
+    root = player._reused_root(board)
+    assert root.visits > 0 and root.visits < visits
+    assert root.parent is None
+
+
+def test_rejects_a_search_without_a_budget():
+    with pytest.raises(ValueError):
+        MCTSPlayer(playouts=None, time_limit=0)
+    with pytest.raises(ValueError):
+        create_player("mcts", time_limit=0)
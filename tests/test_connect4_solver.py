@@ -0,0 +1,63 @@
+import math
+import random
+
+from connect4_board import EMPTY, PIECES, ConnectFourBoard, zobrist_keys
+from connect4_solver import NegamaxPlayer
+
+
+def random_position(rng: random.Random, rows: int, cols: int, plies: int) -> ConnectFourBoard:
+    board = ConnectFourBoard(rows, cols)
+    while board.move_count < plies and not board.check_winner() and not board.is_full():
+        board.drop_piece(rng.choice(board.legal_moves()))
+    return board
+
+
+def root_scores(player: NegamaxPlayer, board: ConnectFourBoard, depth: int):
+    """Root score of every iterative-deepening depth up to `depth`, without a time limit"""
+    player._prepare(board)
+    player._deadline = math.inf
+    if player.tt is not None:
+        player.tt.new_search()
+    return [player._search_root(board, d)[0] for d in range(1, depth + 1)]
+
+
+def test_zobrist_matches_hash_from_scratch():
+    rng = random.Random(0)
+    for _ in range(200):
+        board = random_position(rng, 6, 7, 42)
+        keys = zobrist_keys(board.rows, board.cols)
+        expected = 0
+        for row_index, row in enumerate(board.get_board_state()):
+            height = board.rows - 1 - row_index
+            for col, piece in enumerate(row):
+                if piece != EMPTY:
+                    expected ^= keys[PIECES.index(piece)][col * (board.rows + 1) + height]
+        assert board.zobrist == expected
+
+
+def test_transposition_table_does_not_change_scores():
+    rng = random.Random(1)
+    for rows, cols, depth in ((4, 4, 8), (6, 7, 5)):
+        for _ in range(10):
+            board = random_position(rng, rows, cols, rng.randrange(0, 8))
+            if board.check_winner() or board.is_full():
+                continue
+            before = board.encode()
+            with_table = root_scores(NegamaxPlayer(tt_bytes=1024 * 1024), board, depth)
+            without_table = root_scores(NegamaxPlayer(tt_bytes=0), board, depth)
+            assert with_table == without_table
+            assert board.encode() == before
+
+
+def test_takes_an_immediate_win_and_blocks_one():
+    # RED has three in the bottom row and is to move
+    board = ConnectFourBoard(6, 7)
+    for col in (0, 0, 1, 1, 2, 2):
+        board.drop_piece(col)
+    assert NegamaxPlayer(max_depth=4, time_limit=60).choose_move(board) == 3
+
+    # YELLOW is to move and must stop RED's three in the bottom row
+    board = ConnectFourBoard(6, 7)
+    for col in (0, 6, 1, 6, 2):
+        board.drop_piece(col)
+    assert NegamaxPlayer(max_depth=4, time_limit=60).choose_move(board) == 3
@@ -0,0 +1,65 @@
+import pytest
+
+from connect4_main import Connect4Game, create_player
+from game_records import GameRecord, GameRecordWriter, game_stats, read_records
+
+
+def played_records(n: int):
+    records = []
+    for seed in range(n):
+        game = Connect4Game(6, 7, red_player=create_player("weak", seed=seed), yellow_player=create_player("weak", seed=seed + 100))
+        game.play()
+        records.append(game.record)
+    records.append(GameRecord(4, 4, "llm", "ünïcode-player", [0, 1], [0.5, 1.25], [120, 80], "", 1.7e9, 1.75))
+    return records
+
+
+def assert_same(read: GameRecord, written: GameRecord) -> None:
+    assert (read.rows, read.cols, read.red, read.yellow) == (written.rows, written.cols, written.red, written.yellow)
+    assert (read.moves, read.tokens, read.result, read.started) == (
+        written.moves,
+        written.tokens,
+        written.result,
+        written.started,
+    )
+    # The binary format stores latencies and duration as 32-bit floats
+    assert read.latencies == pytest.approx(written.latencies, rel=1e-6)
+    assert read.duration == pytest.approx(written.duration, rel=1e-6)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".bin"])
+def test_records_round_trip(tmp_path, suffix):
+    path = str(tmp_path / f"games{suffix}")
+    records = played_records(5)
+    with GameRecordWriter(path, buffer_size=2) as writer:
+        for record in records:
+            writer.write(record)
+    read = list(read_records(path))
+    assert len(read) == len(records)
+    for r, w in zip(read, records):
+        assert_same(r, w)
+        assert [b.encode() for b in r.boards()][-1:] == [b.encode() for b in w.boards()][-1:]
+    assert game_stats(read)["games"] == len(records)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".bin"])
+def test_truncated_file_keeps_the_complete_records(tmp_path, suffix):
+    path = tmp_path / f"games{suffix}"
+    records = played_records(3)
+    with GameRecordWriter(str(path)) as writer:
+        for record in records:
+            writer.write(record)
+    path.write_bytes(path.read_bytes()[:-5])
+
+    read = []
+    with pytest.raises(ValueError):
+        for record in read_records(str(path)):
+            read.append(record)
+    assert len(read) == len(records) - 1
+    for r, w in zip(read, records):
+        assert_same(r, w)
+
+
+def test_unknown_result_is_rejected():
+    with pytest.raises(ValueError):
+        GameRecord(result="WINNER - GREEN").to_bytes()
@@ -0,0 +1,46 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from move_protocol import RPSChoice, ask_with_retries, legal_move_model
+
+
+def replies(*contents):
+    """A request function answering with `contents` in order, recording the errors it was shown"""
+    shown = []
+
+    def request(error, attempt):
+        shown.append((error, attempt))
+        return SimpleNamespace(content=contents[attempt - 1])
+
+    return request, shown
+
+
+def test_retries_after_an_invalid_reply():
+    request, shown = replies('{"column": 9}', '{"column": 2, "reason": "center"}')
+    responses = []
+    move = ask_with_retries(request, legal_move_model((0, 1, 2)), "red", on_response=responses.append)
+    assert move.column == 2
+    assert [attempt for _, attempt in shown] == [1, 2]
+    assert shown[0][0] == "" and "column" in shown[1][0]
+    assert len(responses) == 2
+
+
+def test_async_requests_share_the_loop():
+    request, shown = replies("Lizard", '{"choice": "Paper"}')
+
+    async def arequest(error, attempt):
+        await asyncio.sleep(0)
+        return request(error, attempt)
+
+    responses = []
+    choice = asyncio.run(ask_with_retries(arequest, RPSChoice, "yellow", on_response=responses.append))
+    assert choice.choice == "Paper"
+    assert len(shown) == len(responses) == 2
+
+
+def test_raises_once_every_attempt_is_rejected():
+    request, _ = replies("Lizard", "Spock")
+    with pytest.raises(ValueError, match="after 2 attempts"):
+        ask_with_retries(request, RPSChoice, "red")
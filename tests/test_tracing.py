@@ -0,0 +1,109 @@
+import asyncio
+from dataclasses import dataclass
+from typing import List
+
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+from fake_model import FakeModel
+from tracing import Tracer, openmetrics
+
+
+@dataclass
+class LoopingModel(FakeModel):
+    """Answers after `steps` model calls, re-entering itself for each step as agno's tool loop does"""
+
+    steps: int = 4
+
+    def _step(self, messages: List[Message]) -> bool:
+        """Add a tool result after every step but the last; True while the loop goes on"""
+        if self.calls >= self.steps:
+            return False
+        messages.append(Message(role="tool", content="tool result " * 10))
+        return True
+
+    def response(self, messages: List[Message]) -> ModelResponse:
+        content = self.invoke(messages)
+        self._assistant_message(messages, content)
+        if self._step(messages):
+            return self.response(messages)
+        return ModelResponse(content=content)
+
+    async def aresponse(self, messages: List[Message]) -> ModelResponse:
+        content = await self.ainvoke(messages)
+        self._assistant_message(messages, content)
+        if self._step(messages):
+            return await self.aresponse(messages)
+        return ModelResponse(content=content)
+
+    def response_stream(self, messages: List[Message]):
+        content = self.invoke(messages)
+        self._assistant_message(messages, content)
+        yield ModelResponse(content=content)
+        if self._step(messages):
+            yield from self.response_stream(messages)
+
+    async def aresponse_stream(self, messages: List[Message]):
+        content = await self.ainvoke(messages)
+        self._assistant_message(messages, content)
+        yield ModelResponse(content=content)
+        if self._step(messages):
+            async for chunk in self.aresponse_stream(messages):
+                yield chunk
+
+
+def sent_tokens(messages: List[Message]):
+    steps = [m for m in messages if m.role == "assistant"]
+    return sum(m.metrics["input_tokens"] for m in steps), sum(m.metrics["output_tokens"] for m in steps)
+
+
+def run(mode: str):
+    tracer = Tracer()
+    model = tracer.wrap(LoopingModel(responses=["thinking about the next move"]), "master_agent")
+    messages = [Message(role="user", content="Play the game " * 20)]
+    if mode == "sync":
+        model.response(messages)
+    elif mode == "stream":
+        list(model.response_stream(messages))
+    elif mode == "async":
+        asyncio.run(model.aresponse(messages))
+    else:
+
+        async def consume():
+            async for _ in model.aresponse_stream(messages):
+                pass
+
+        asyncio.run(consume())
+    return tracer, model, messages
+
+
+def test_tool_loop_records_one_span_with_the_tokens_sent():
+    for mode in ("sync", "stream", "async", "async_stream"):
+        tracer, model, messages = run(mode)
+        assert model.calls == 4
+        assert len(tracer.spans) == 1, mode
+        span = tracer.spans[0]
+        assert (span.input_tokens, span.output_tokens) == sent_tokens(messages)
+        assert (span.ttft is not None) == mode.endswith("stream")
+
+
+def test_a_second_call_gets_its_own_span():
+    tracer = Tracer()
+    model = tracer.wrap(LoopingModel(responses=["ok"], steps=1), "player_red_agent")
+    model.response([Message(role="user", content="first")])
+    model.response([Message(role="user", content="second")])
+    assert len(tracer.spans) == 2
+    assert tracer.summary()[""]["player_red_agent"]["calls"] == 2
+
+
+def test_openmetrics_groups_samples_by_family():
+    tracer, _, _ = run("sync")
+    lines = openmetrics(tracer.spans).splitlines()
+    assert lines[-1] == "# EOF"
+    family = None
+    for line in lines[:-1]:
+        if line.startswith("# TYPE "):
+            family = line.split()[2]
+        else:
+            assert line.startswith(family)
+    assert not any(line.startswith("agent_ttft_seconds") for line in lines)
@@ -0,0 +1,250 @@
+import argparse
+import itertools
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from game_records import GameRecord, GameRecordWriter
+
+
+GAMES = ("connect4", "rps")
+RESULTS = ("WINNER - RED", "WINNER - YELLOW", "TIE", "DRAW")
+
+
+class GameTimeout(Exception):
+    """Raised from the move callback when a game runs past its time budget"""
+
+
+@dataclass
+class GameTask:
+    game: str
+    red: str
+    yellow: str
+    seed: int
+    timeout: float
+    rows: int = 4
+    cols: int = 4
+    rounds: int = 5
+    move_time: Optional[float] = None
+
+
+@dataclass
+class GameOutcome:
+    red: str
+    yellow: str
+    seed: int
+    result: str
+    duration: float
+    error: str = ""
+    # Final Connect Four position in ConnectFourBoard.encode() form
+    board: str = ""
+    # Full Connect Four move record, written out with --records
+    record: Optional[GameRecord] = None
+
+
+def play_game(task: GameTask) -> GameOutcome:
+    """Play a single game with local players. Runs inside a pool worker."""
+    start = time.perf_counter()
+    deadline = start + task.timeout
+
+    # Local searching players with their own per-move time limits
+    searchers: List[Tuple[object, float]] = []
+
+    def check_deadline(*_) -> None:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise GameTimeout(f"Game exceeded {task.timeout}s")
+        # No search may run past the game's budget; LLM moves are only checked once they return
+        for player, time_limit in searchers:
+            player.time_limit = min(time_limit, remaining)
+
+    try:
+        if task.game == "connect4":
+            from connect4_main import Connect4Game, create_player
+
+            game = Connect4Game(
+                task.rows,
+                task.cols,
+                red_player=create_player(task.red, seed=task.seed, time_limit=task.move_time),
+                yellow_player=create_player(task.yellow, seed=task.seed + 1, time_limit=task.move_time),
+            )
+            game.record.red, game.record.yellow = task.red, task.yellow
+            searchers = [(p, p.time_limit) for p in game.players.values() if getattr(p, "time_limit", None)]
+            check_deadline()
+            result = game.play(on_move=check_deadline)
+            return GameOutcome(
+                task.red,
+                task.yellow,
+                task.seed,
+                result,
+                time.perf_counter() - start,
+                board=game.board.encode(),
+                record=game.record,
+            )
+        else:
+            from rock_paper_scissor_main import RockPaperScissorsGame, create_player
+
+            game = RockPaperScissorsGame(
+                red_player=create_player(task.red, seed=task.seed),
+                yellow_player=create_player(task.yellow, seed=task.seed + 1),
+            )
+            result = game.play(rounds=task.rounds, on_round=check_deadline)
+            return GameOutcome(task.red, task.yellow, task.seed, result, time.perf_counter() - start)
+    except Exception as e:
+        result = "TIMEOUT" if isinstance(e, GameTimeout) else "ERROR"
+        return GameOutcome(task.red, task.yellow, task.seed, result, time.perf_counter() - start, str(e))
+
+
+def build_tasks(
+    game: str,
+    pairings: List[Tuple[str, str]],
+    games_per_pairing: int,
+    seed: int,
+    timeout: float,
+    **options,
+) -> Iterator[GameTask]:
+    """One task per game, with a distinct, reproducible seed for each"""
+    for pairing_index, (red, yellow) in enumerate(pairings):
+        for game_index in range(games_per_pairing):
+            game_seed = seed + 2 * (pairing_index * games_per_pairing + game_index)
+            yield GameTask(game, red, yellow, game_seed, timeout, **options)
+
+
+def estimate_elo(outcomes: List[GameOutcome], iterations: int = 200, base: float = 1500.0) -> Dict[str, float]:
+    """Fit Elo ratings to all finished games with batch updates on the logistic model.
+
+    Every player also gets one virtual draw against a `base`-rated anchor, which
+    keeps ratings finite for players that won or lost every game.
+    """
+    games = [o for o in outcomes if o.result in RESULTS]
+    players = sorted({o.red for o in games} | {o.yellow for o in games})
+    ratings = {player: base for player in players}
+
+    def expected(rating: float, opponent: float) -> float:
+        return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+    for _ in range(iterations):
+        delta = {player: 0.5 - expected(ratings[player], base) for player in players}
+        counts = {player: 1 for player in players}
+        for o in games:
+            actual = 1.0 if o.result == "WINNER - RED" else 0.0 if o.result == "WINNER - YELLOW" else 0.5
+            residual = actual - expected(ratings[o.red], ratings[o.yellow])
+            delta[o.red] += residual
+            delta[o.yellow] -= residual
+            counts[o.red] += 1
+            counts[o.yellow] += 1
+        for player in players:
+            ratings[player] += 400 * delta[player] / counts[player]
+
+    return {player: round(rating, 1) for player, rating in ratings.items()}
+
+
+def summarize(outcomes: List[GameOutcome]) -> Dict[str, Dict[str, float]]:
+    """Aggregate win/draw/loss counts per player across both colours"""
+    table: Dict[str, Dict[str, float]] = defaultdict(lambda: {"games": 0, "wins": 0, "draws": 0, "losses": 0, "errors": 0})
+    for o in outcomes:
+        for player, color in ((o.red, "RED"), (o.yellow, "YELLOW")):
+            row = table[player]
+            row["games"] += 1
+            if o.result not in RESULTS:
+                row["errors"] += 1
+            elif o.result in ("TIE", "DRAW"):
+                row["draws"] += 1
+            elif o.result == f"WINNER - {color}":
+                row["wins"] += 1
+            else:
+                row["losses"] += 1
+
+    for player, elo in estimate_elo(outcomes).items():
+        table[player]["elo"] = elo
+    return dict(table)
+
+
+def run_tournament(tasks: List[GameTask], workers: Optional[int] = None) -> List[GameOutcome]:
+    """Play every task across a process pool, returning outcomes in task order; workers=1 plays in this process"""
+    if workers == 1:
+        return [play_game(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map keeps task order, so --output and --records come out the same on every run
+        return list(pool.map(play_game, tasks))
+
+
+def print_table(table: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'player':<12}{'games':>8}{'wins':>8}{'draws':>8}{'losses':>8}{'errors':>8}{'elo':>10}")
+    for player, row in sorted(table.items(), key=lambda item: -item[1].get("elo", 0)):
+        print(
+            f"{player:<12}{row['games']:>8}{row['wins']:>8}{row['draws']:>8}"
+            f"{row['losses']:>8}{row['errors']:>8}{row.get('elo', 0):>10}"
+        )
+
+
+def parse_pairing(value: str) -> Tuple[str, str]:
+    red, _, yellow = value.partition(":")
+    if not red or not yellow:
+        raise argparse.ArgumentTypeError(f"Pairing must look like RED:YELLOW, got {value!r}")
+    return red, yellow
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a tournament between local players")
+    parser.add_argument("game", choices=GAMES)
+    parser.add_argument("--players", nargs="+", help="Players for a round robin, each pair played with both colours")
+    parser.add_argument("--pairings", nargs="+", type=parse_pairing, help="Explicit RED:YELLOW pairings")
+    parser.add_argument("--games", type=int, default=100, help="Games per pairing")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Per-game timeout in seconds; local searches are cut to the time left, LLM moves are checked between moves",
+    )
+    parser.add_argument("--move-time", type=float, default=None, help="Per-move search budget for Connect Four players")
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--cols", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per Rock-Paper-Scissors match")
+    parser.add_argument("--output", help="Write the aggregated table and raw outcomes to this JSON file")
+    parser.add_argument("--records", help="Append finished Connect Four games to this record file (.jsonl or .bin)")
+    args = parser.parse_args()
+
+    if args.pairings:
+        pairings = args.pairings
+    elif args.players:
+        pairings = list(itertools.permutations(args.players, 2))
+    else:
+        parser.error("Provide --players or --pairings")
+
+    if args.move_time is not None and args.move_time <= 0:
+        parser.error("--move-time must be positive")
+
+    if args.game == "connect4":
+        options = {"rows": args.rows, "cols": args.cols, "move_time": args.move_time}
+    else:
+        options = {"rounds": args.rounds}
+    tasks = list(build_tasks(args.game, pairings, args.games, args.seed, args.timeout, **options))
+
+    start = time.perf_counter()
+    outcomes = run_tournament(tasks, args.workers)
+    elapsed = time.perf_counter() - start
+
+    table = summarize(outcomes)
+    print_table(table)
+    print(f"\n{len(outcomes)} games in {elapsed:.1f}s ({len(outcomes) / elapsed * 60:.0f} games/min)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            games = [{k: v for k, v in asdict(o).items() if k != "record"} for o in outcomes]
+            json.dump({"table": table, "games": games}, f, indent=2)
+
+    if args.records:
+        with GameRecordWriter(args.records) as writer:
+            for o in outcomes:
+                if o.record is not None:
+                    writer.write(o.record)
+
+
+if __name__ == "__main__":
+    main()
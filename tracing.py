@@ -0,0 +1,343 @@
+import argparse
+import json
+import math
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from agno.models.base import Model
+from agno.models.message import Message
+
+
+@dataclass
+class Span:
+    """One call to an agent's model, from the first step of its tool loop to the last.
+
+    agno re-enters the model for every tool-loop step; those nested calls are
+    folded into the outermost span, whose tokens are summed over all steps.
+    A master's span also spans the player calls its tools make, which get
+    spans of their own on the players' models.
+    """
+
+    game: str
+    game_id: str
+    agent: str
+    move: int
+    attempt: int
+    start: float
+    wall_time: float
+    # Seconds until the first streamed chunk; None for non-streaming calls
+    ttft: Optional[float]
+    input_tokens: int
+    output_tokens: int
+    error: str = ""
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+# Game, game_id, move and attempt of the agent call being made in the current thread or task
+_trace_context: ContextVar[Dict[str, Any]] = ContextVar("trace_context", default={})
+
+
+class Tracer:
+    """Records a Span for every model call of the agents it wraps.
+
+    Games call `annotate` with the game, move and attempt before asking an
+    agent, and the values are kept in a ContextVar so concurrent asyncio games
+    do not mix up their spans. Spans are appended to `path` as JSON lines in
+    batches of `buffer_size`; a path ending in '.prom' instead gets an
+    OpenMetrics summary of all spans on close().
+    """
+
+    def __init__(self, path: Optional[str] = None, buffer_size: int = 64):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.spans: List[Span] = []
+        self._unwritten = 0
+
+    def annotate(self, **context) -> None:
+        """Attach game, game_id, move or attempt to the spans recorded from here on"""
+        _trace_context.set({**_trace_context.get(), **context})
+
+    def wrap(self, model: Model, agent: str) -> Model:
+        """Time every response of the model, including streamed ones, and count its tokens.
+
+        agno calls the model's response methods again for each step of a tool
+        loop; those nested calls pass straight through, so only the outermost
+        call records a span.
+        """
+        response, aresponse = model.response, model.aresponse
+        response_stream, aresponse_stream = model.response_stream, model.aresponse_stream
+        # Whether a traced call of this model is already running in the current thread or task
+        active: ContextVar[bool] = ContextVar(f"trace_active_{agent}", default=False)
+
+        def traced_response(messages: List[Message]):
+            if active.get():
+                return response(messages)
+            start, count, context = time.perf_counter(), len(messages), _trace_context.get()
+            active.set(True)
+            try:
+                result = response(messages)
+            except Exception as e:
+                self._record(agent, context, start, None, messages, count, str(e))
+                raise
+            finally:
+                active.set(False)
+            self._record(agent, context, start, None, messages, count)
+            return result
+
+        async def traced_aresponse(messages: List[Message]):
+            if active.get():
+                return await aresponse(messages)
+            start, count, context = time.perf_counter(), len(messages), _trace_context.get()
+            active.set(True)
+            try:
+                result = await aresponse(messages)
+            except Exception as e:
+                self._record(agent, context, start, None, messages, count, str(e))
+                raise
+            finally:
+                active.set(False)
+            self._record(agent, context, start, None, messages, count)
+            return result
+
+        def traced_response_stream(messages: List[Message]):
+            if active.get():
+                yield from response_stream(messages)
+                return
+            start, count, context, ttft = time.perf_counter(), len(messages), _trace_context.get(), None
+            active.set(True)
+            try:
+                for chunk in response_stream(messages):
+                    if ttft is None and chunk.content:
+                        ttft = time.perf_counter() - start
+                    yield chunk
+            except Exception as e:
+                self._record(agent, context, start, ttft, messages, count, str(e))
+                raise
+            finally:
+                active.set(False)
+            self._record(agent, context, start, ttft, messages, count)
+
+        async def traced_aresponse_stream(messages: List[Message]):
+            if active.get():
+                async for chunk in aresponse_stream(messages):
+                    yield chunk
+                return
+            start, count, context, ttft = time.perf_counter(), len(messages), _trace_context.get(), None
+            active.set(True)
+            try:
+                async for chunk in aresponse_stream(messages):
+                    if ttft is None and chunk.content:
+                        ttft = time.perf_counter() - start
+                    yield chunk
+            except Exception as e:
+                self._record(agent, context, start, ttft, messages, count, str(e))
+                raise
+            finally:
+                active.set(False)
+            self._record(agent, context, start, ttft, messages, count)
+
+        model.response = traced_response
+        model.aresponse = traced_aresponse
+        model.response_stream = traced_response_stream
+        model.aresponse_stream = traced_aresponse_stream
+        return model
+
+    def _record(
+        self,
+        agent: str,
+        context: Dict[str, Any],
+        start: float,
+        ttft: Optional[float],
+        messages: List[Message],
+        count: int,
+        error: str = "",
+    ) -> None:
+        """Store a span, tagged with the context the call started in"""
+        wall_time = time.perf_counter() - start
+        # Tokens of every assistant message the call added, e.g. each step of a tool loop
+        added = [m for m in messages[count:] if m.role == "assistant" and m.metrics]
+        self.spans.append(
+            Span(
+                game=context.get("game", ""),
+                game_id=context.get("game_id", ""),
+                agent=agent,
+                move=context.get("move", 0),
+                attempt=context.get("attempt", 1),
+                start=time.time() - wall_time,
+                wall_time=wall_time,
+                ttft=ttft,
+                input_tokens=sum(m.metrics.get("input_tokens", 0) for m in added),
+                output_tokens=sum(m.metrics.get("output_tokens", 0) for m in added),
+                error=error,
+            )
+        )
+        self._unwritten += 1
+        if self._unwritten >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.path is None or self.path.endswith(".prom") or not self._unwritten:
+            return
+        with open(self.path, "a") as f:
+            for span in self.spans[-self._unwritten:]:
+                f.write(json.dumps(asdict(span), separators=(",", ":")) + "\n")
+        self._unwritten = 0
+
+    def close(self) -> None:
+        if self.path is not None and self.path.endswith(".prom"):
+            with open(self.path, "w") as f:
+                f.write(openmetrics(self.spans))
+        else:
+            self.flush()
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        return summarize(self.spans)
+
+
+def summarize(spans: Iterable[Span]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Per game: latency, time-to-first-token, tokens and retries per agent, and totals per played game"""
+    by_agent: Dict[tuple, List[Span]] = defaultdict(list)
+    per_game: Dict[tuple, Dict[str, float]] = defaultdict(lambda: {"first": math.inf, "last": 0.0, "tokens": 0})
+    for span in spans:
+        by_agent[(span.game, span.agent)].append(span)
+        # Game wall time runs from its first call to its last, as master spans overlap their players' spans
+        totals = per_game[(span.game, span.game_id)]
+        totals["first"] = min(totals["first"], span.start)
+        totals["last"] = max(totals["last"], span.start + span.wall_time)
+        totals["tokens"] += span.input_tokens + span.output_tokens
+
+    report: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+    for (game, agent), agent_spans in sorted(by_agent.items()):
+        latencies = [s.wall_time for s in agent_spans]
+        ttfts = [s.ttft for s in agent_spans if s.ttft is not None]
+        tokens = [s.input_tokens + s.output_tokens for s in agent_spans]
+        report[game][agent] = {
+            "calls": len(agent_spans),
+            "retries": sum(1 for s in agent_spans if s.attempt > 1),
+            "errors": sum(1 for s in agent_spans if s.error),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "ttft_p50": percentile(ttfts, 50),
+            "ttft_p95": percentile(ttfts, 95),
+            # Calls that streamed, and so have a time-to-first-token
+            "streamed": len(ttfts),
+            "input_tokens": sum(s.input_tokens for s in agent_spans),
+            "output_tokens": sum(s.output_tokens for s in agent_spans),
+            "tokens_per_call": sum(tokens) / len(tokens),
+        }
+    games: Dict[str, List[Dict[str, float]]] = defaultdict(list)
+    for (game, _), totals in per_game.items():
+        games[game].append(totals)
+    for game, totals in games.items():
+        report[game]["per_game"] = {
+            "games": len(totals),
+            "wall_time_p50": percentile([t["last"] - t["first"] for t in totals], 50),
+            "wall_time_p95": percentile([t["last"] - t["first"] for t in totals], 95),
+            "tokens_p50": percentile([t["tokens"] for t in totals], 50),
+            "tokens_p95": percentile([t["tokens"] for t in totals], 95),
+        }
+    return dict(report)
+
+
+def openmetrics(spans: Iterable[Span]) -> str:
+    """OpenMetrics text: latency and time-to-first-token quantiles, call, retry and token counters
+    per game and agent, and wall time and token quantiles per played game"""
+    report = summarize(spans)
+    agent_rows = [
+        (f'game="{game}",agent="{agent}"', row)
+        for game, agents in report.items()
+        for agent, row in agents.items()
+        if agent != "per_game"
+    ]
+    game_rows = [(f'game="{game}"', agents["per_game"]) for game, agents in report.items() if "per_game" in agents]
+    quantiles = (("50", "0.5"), ("95", "0.95"))
+
+    def quantile_samples(name: str, rows, key: str) -> List[str]:
+        return [
+            f'{name}{{{labels},quantile="{quantile}"}} {row[f"{key}_p{q}"]:.6f}'
+            for labels, row in rows
+            for q, quantile in quantiles
+        ]
+
+    # Each family's samples must directly follow its own TYPE line
+    families = [
+        ("agent_latency_seconds", "summary", quantile_samples("agent_latency_seconds", agent_rows, "latency")),
+        (
+            "agent_ttft_seconds",
+            "summary",
+            quantile_samples("agent_ttft_seconds", [(l, r) for l, r in agent_rows if r["streamed"]], "ttft"),
+        ),
+        ("agent_calls", "counter", [f"agent_calls_total{{{labels}}} {row['calls']}" for labels, row in agent_rows]),
+        ("agent_retries", "counter", [f"agent_retries_total{{{labels}}} {row['retries']}" for labels, row in agent_rows]),
+        (
+            "agent_tokens",
+            "counter",
+            [
+                f'agent_tokens_total{{{labels},kind="{kind}"}} {row[f"{kind}_tokens"]}'
+                for labels, row in agent_rows
+                for kind in ("input", "output")
+            ],
+        ),
+        ("game_wall_time_seconds", "summary", quantile_samples("game_wall_time_seconds", game_rows, "wall_time")),
+        ("game_tokens", "summary", quantile_samples("game_tokens", game_rows, "tokens")),
+    ]
+    lines = []
+    for name, kind, samples in families:
+        if samples:
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def read_spans(path: str) -> Iterator[Span]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield Span(**json.loads(line))
+
+
+def print_report(report: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    for game, agents in report.items():
+        print(f"\n{game or 'untagged'}")
+        print(f"{'agent':<22}{'calls':>7}{'retries':>9}{'p50 s':>9}{'p95 s':>9}{'ttft p50':>10}{'tokens/call':>13}")
+        for agent, row in agents.items():
+            if agent == "per_game":
+                continue
+            print(
+                f"{agent:<22}{row['calls']:>7}{row['retries']:>9}{row['latency_p50']:>9.2f}"
+                f"{row['latency_p95']:>9.2f}{row['ttft_p50']:>10.2f}{row['tokens_per_call']:>13.0f}"
+            )
+        per_game = agents.get("per_game")
+        if per_game:
+            print(
+                f"{per_game['games']} games: wall time p50 {per_game['wall_time_p50']:.1f}s "
+                f"p95 {per_game['wall_time_p95']:.1f}s, tokens p50 {per_game['tokens_p50']:.0f} "
+                f"p95 {per_game['tokens_p95']:.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize agent traces written by Tracer")
+    parser.add_argument("path", help="JSONL trace file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    report = summarize(read_spans(args.path))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()